@@ -18,7 +18,7 @@ df = df.filter([pl.col("action_taken")=="1"])
 df = df.filter(pl.col('activity_year')=="2024")
 
 # See how many total originations there are
-logger.info("Length: %s", df.select(pl.len()).collect())
+logger.info("Length: %s", df.select(pl.len()).collect(engine="streaming"))
 
 # Columns missing for exempt
 exempt_columns = [
@@ -51,24 +51,34 @@ exempt_columns = [
     "denial_reason_1",
 ]
 
-# Then filter and select the desired columns
-df_exemptions = (
-    df.with_columns(
-        # Count Exemptions by summing boolean conditions cast to integers
+# Only check exempt columns present in this release
+present_exempt_columns = [
+    column for column in exempt_columns if column in df.collect_schema().names()
+]
+
+# Count exemptions per loan
+df_counts = (
+    df.select(["HMDAIndex", "lei", "activity_year"] + present_exempt_columns)
+    .with_columns(
+        # Count Exemptions by summing boolean conditions horizontally
         pl.sum_horizontal(
             [
-                pl.col(column).cast(pl.Utf8).is_in(["1111", "Exempt"]).cast(pl.Int64)
-                for column in exempt_columns if column in df.columns
+                pl.col(column).cast(pl.Utf8).is_in(["1111", "Exempt"])
+                for column in present_exempt_columns
             ]
         ).alias("CountExemptions")
     )
-    .with_columns(
-        # Calculate Average Exemptions per LEI using a window function
-        pl.col("CountExemptions")
-        .mean()
-        .over(["lei", "activity_year"])
-        .alias("AverageExemptions")
-    )
+)
+
+# Calculate Average Exemptions per LEI with a group-by + join rather than a
+# window function so the whole chain runs on the streaming engine
+lei_averages = df_counts.group_by(["lei", "activity_year"]).agg(
+    pl.col("CountExemptions").mean().alias("AverageExemptions")
+)
+
+# Then filter and select the desired columns
+df_exemptions = (
+    df_counts.join(lei_averages, on=["lei", "activity_year"], how="left")
     .filter(
         # Filter based on the calculated AverageExemptions
         (pl.col("AverageExemptions") < 26) & (pl.col("AverageExemptions") >= 1)
@@ -76,12 +86,12 @@ df_exemptions = (
     .select(
         # Select the final set of columns
         ["HMDAIndex", "lei", "activity_year"]
-        + [column for column in exempt_columns if column in df.columns]
+        + present_exempt_columns
         + ["CountExemptions", "AverageExemptions"]
     )
 )
 
 # See How Many "Weird" Reporters there are
-logger.info("Length: %s", df_exemptions.select(pl.len()).collect())
+logger.info("Length: %s", df_exemptions.select(pl.len()).collect(engine="streaming"))
 
-df_exemptions = df_exemptions.collect()
+df_exemptions = df_exemptions.collect(engine="streaming")
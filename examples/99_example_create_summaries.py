@@ -9,7 +9,7 @@ using the hmda_data_manager package.
 The summary creation includes:
 1. Combining post-2018 Panel and Transmittal Sheet data 
 2. Combining pre-2018 Panel and Transmittal Sheet data
-3. Creating both CSV and Parquet outputs
+3. Creating Parquet outputs
 4. Data validation and quality checks
 5. Summary statistics and reporting
 
@@ -23,8 +23,12 @@ Author: Jonathan E. Becker
 Created: October 2025
 """
 
+import fnmatch
 import logging
+import os
+import re
 import polars as pl
+import pyarrow.parquet as pq
 from pathlib import Path
 
 # Import the summary functions and configuration
@@ -43,8 +47,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
-    """Main workflow for creating HMDA lender summary datasets."""
+# Combined outputs are named hmda_lenders_combined_<min_year>-<max_year>
+COMBINED_YEAR_RANGE = re.compile(r"_(\d{4})-(\d{4})$")
+
+def find_lender_files() -> dict[str, list[Path]]:
+    """List post- and pre-2018 panel/TS inputs with one directory pass per folder."""
+    files = {"post_panel": [], "post_ts": [], "pre_panel": [], "pre_ts": []}
+    folder_patterns = [
+        ("panel", CLEAN_DIR / "panel", "*_public_panel*.parquet", "*panel*.csv"),
+        ("ts", CLEAN_DIR / "transmissal_series", "*_public_ts*.parquet", "*ts*.csv"),
+    ]
+    for key, folder, post_pattern, pre_pattern in folder_patterns:
+        if not folder.is_dir():
+            continue
+        with os.scandir(folder) as entries:
+            names = [entry.name for entry in entries if entry.is_file()]
+        files[f"post_{key}"] = [folder / name for name in fnmatch.filter(names, post_pattern)]
+        files[f"pre_{key}"] = [folder / name for name in fnmatch.filter(names, pre_pattern)]
+    return files
+
+def main(files: dict[str, list[Path]] | None = None):
+    """Main workflow for creating HMDA lender summary datasets.
+
+    Parameters
+    ----------
+    files : dict, optional
+        Input file lists as returned by ``validate_requirements``. Listed from
+        disk when not provided.
+    """
+    if files is None:
+        files = find_lender_files()
     
     logger.info("Starting HMDA Lender Summary Creation")
     logger.info("=" * 50)
@@ -93,8 +125,8 @@ def main():
         post2018_max_year = 2024
         
         # Check what files are available
-        panel_files = list(panel_folder.glob("*_public_panel*.parquet"))
-        ts_files = list(ts_folder.glob("*_public_ts*.parquet"))
+        panel_files = files["post_panel"]
+        ts_files = files["post_ts"]
         
         logger.info(f"  Found {len(panel_files)} panel files")
         logger.info(f"  Found {len(ts_files)} transmittal sheet files")
@@ -110,20 +142,18 @@ def main():
                 ts_folder=ts_folder,
                 save_folder=data_folder,
                 min_year=post2018_min_year,
-                max_year=post2018_max_year
+                max_year=post2018_max_year,
+                csv=False,
+                parquet_compression="zstd",
+                parquet_compression_level=1,
             )
             
             logger.info("  ✅ Post-2018 combined dataset created successfully")
             
             # Check output files
             expected_stem = f"hmda_lenders_combined_{post2018_min_year}-{post2018_max_year}"
-            csv_file = data_folder / f"{expected_stem}.csv"
             parquet_file = data_folder / f"{expected_stem}.parquet"
             
-            if csv_file.exists():
-                file_size_mb = csv_file.stat().st_size / (1024 * 1024)
-                logger.info(f"  📁 CSV file: {csv_file.name} ({file_size_mb:.1f} MB)")
-            
             if parquet_file.exists():
                 file_size_mb = parquet_file.stat().st_size / (1024 * 1024)
                 logger.info(f"  📁 Parquet file: {parquet_file.name} ({file_size_mb:.1f} MB)")
@@ -144,8 +174,8 @@ def main():
         pre2018_max_year = 2017
         
         # Check for CSV files (pre-2018 data is typically in CSV format)
-        panel_csv_files = list(panel_folder.glob("*panel*.csv"))
-        ts_csv_files = list(ts_folder.glob("*ts*.csv"))
+        panel_csv_files = files["pre_panel"]
+        ts_csv_files = files["pre_ts"]
         
         logger.info(f"  Found {len(panel_csv_files)} pre-2018 panel CSV files")
         logger.info(f"  Found {len(ts_csv_files)} pre-2018 transmittal sheet CSV files")
@@ -162,18 +192,21 @@ def main():
                 ts_folder=ts_folder,
                 save_folder=data_folder,
                 min_year=pre2018_min_year,
-                max_year=pre2018_max_year
+                max_year=pre2018_max_year,
+                csv=False,
+                parquet_compression="zstd",
+                parquet_compression_level=1,
             )
             
             logger.info("  ✅ Pre-2018 combined dataset created successfully")
             
             # Check output file
             expected_stem = f"hmda_lenders_combined_{pre2018_min_year}-{pre2018_max_year}"
-            csv_file = data_folder / f"{expected_stem}.csv"
+            parquet_file = data_folder / f"{expected_stem}.parquet"
             
-            if csv_file.exists():
-                file_size_mb = csv_file.stat().st_size / (1024 * 1024)
-                logger.info(f"  📁 CSV file: {csv_file.name} ({file_size_mb:.1f} MB)")
+            if parquet_file.exists():
+                file_size_mb = parquet_file.stat().st_size / (1024 * 1024)
+                logger.info(f"  📁 Parquet file: {parquet_file.name} ({file_size_mb:.1f} MB)")
         
     except Exception as e:
         logger.error(f"  ❌ Error creating pre-2018 combined dataset: {e}")
@@ -186,9 +219,8 @@ def main():
     logger.info("4. Validating created datasets and generating summary statistics...")
     
     try:
-        # Find all created combined files
-        combined_files = list(data_folder.glob("hmda_lenders_combined_*.parquet")) + \
-                        list(data_folder.glob("hmda_lenders_combined_*.csv"))
+        # Find all created combined files (Parquet is the only output format)
+        combined_files = list(data_folder.glob("hmda_lenders_combined_*.parquet"))
         
         logger.info(f"  📊 Found {len(combined_files)} combined lender files:")
         
@@ -196,29 +228,25 @@ def main():
             logger.info(f"  Analyzing: {file.name}")
             
             try:
-                # Load file appropriately based on format
-                if file.suffix == '.parquet':
-                    df = pl.scan_parquet(file)
-                elif file.suffix == '.csv':
-                    # Use pipe separator as that's what the functions create
-                    df = pl.scan_csv(file, separator="|")
-                else:
-                    continue
-                
-                # Get basic statistics
-                row_count = df.select(pl.len()).collect().item()
-                columns = df.columns
+                # Get basic statistics from the Parquet footer (no row groups decoded)
+                metadata = pq.ParquetFile(file).metadata
+                row_count = metadata.num_rows
+                columns = metadata.schema.names
                 
                 logger.info(f"    - Rows: {row_count:,}")
                 logger.info(f"    - Columns: {len(columns)}")
                 
-                # Check for key columns based on data period
-                if "2018" in file.name or "2019" in file.name or "202" in file.name:  # Post-2018
+                # Check for key columns based on the data period encoded in the file stem
+                match = COMBINED_YEAR_RANGE.search(file.stem)
+                if match is None:
+                    logger.warning(f"    ⚠️  Cannot parse year range from {file.name}, skipping")
+                    continue
+                min_year, max_year = int(match[1]), int(match[2])
+                expected_years = list(range(min_year, max_year + 1))
+                if min_year >= 2018:  # Post-2018
                     key_columns = ["activity_year", "lei"]
-                    expected_years = list(range(2018, 2025))
                 else:  # Pre-2018
                     key_columns = ["Activity Year", "Respondent ID"]
-                    expected_years = list(range(2007, 2018))
                 
                 missing_key_cols = [col for col in key_columns if col not in columns]
                 if missing_key_cols:
@@ -226,6 +254,11 @@ def main():
                 else:
                     logger.info(f"    ✅ Key columns present: {key_columns}")
                 
+                # Project the key columns up front so only their pages are read.
+                # Validation only needs aggregates: skip rechunking and keep buffers small
+                present_key_cols = [col for col in key_columns if col in columns]
+                df = pl.scan_parquet(file, low_memory=True, rechunk=False).select(present_key_cols)
+                
                 # Check year coverage if we have year column
                 year_col = key_columns[0]  # First key column is usually the year
                 if year_col in columns:
@@ -236,12 +269,12 @@ def main():
                     )
                     logger.info(f"    📅 Years covered: {min(years_present)} to {max(years_present)}")
                     
-                    missing_years = [year for year in expected_years if year not in years_present]
+                    missing_years = sorted(set(expected_years).difference(years_present))
                     if missing_years:
                         logger.warning(f"    ⚠️  Missing years: {missing_years}")
                 
                 # Check for duplicate lenders
-                if len(key_columns) == 2:
+                if not missing_key_cols:
                     duplicates = (
                         df.group_by(key_columns)
                         .agg(pl.len().alias("count"))
@@ -295,28 +328,29 @@ def main():
     
     return True
 
-def validate_requirements():
-    """Check if required data files are available."""
-    
-    panel_folder = CLEAN_DIR / "panel"
-    ts_folder = CLEAN_DIR / "transmissal_series"
+def validate_requirements() -> dict[str, list[Path]]:
+    """Check if required data files are available.
+
+    Returns the discovered input file lists (keys ``post_panel``, ``post_ts``,
+    ``pre_panel``, ``pre_ts``) so ``main`` can reuse them without re-listing.
+    Post-2018 requirements are met when both post-2018 lists are non-empty.
+    """
     
-    requirements_met = True
+    files = find_lender_files()
     
     # Check for post-2018 files
-    post2018_panel = list(panel_folder.glob("*_public_panel*.parquet"))
-    post2018_ts = list(ts_folder.glob("*_public_ts*.parquet"))
+    post2018_panel = files["post_panel"]
+    post2018_ts = files["post_ts"]
     
     if post2018_panel and post2018_ts:
         print("[OK] Post-2018 data files available")
     else:
         print("[ERROR] Post-2018 data files missing")
         print("   Run: python examples/example_import_workflow_post2018.py")
-        requirements_met = False
     
     # Check for pre-2018 files
-    pre2018_panel = list(panel_folder.glob("*panel*.csv"))
-    pre2018_ts = list(ts_folder.glob("*ts*.csv"))
+    pre2018_panel = files["pre_panel"]
+    pre2018_ts = files["pre_ts"]
     
     if pre2018_panel and pre2018_ts:
         print("[OK] Pre-2018 data files available")
@@ -325,7 +359,7 @@ def validate_requirements():
     else:
         print("[WARNING] Partial pre-2018 data files found")
     
-    return requirements_met
+    return files
 
 if __name__ == "__main__":
     """
@@ -349,14 +383,15 @@ if __name__ == "__main__":
     
     # Check requirements first
     print("\nChecking requirements...")
-    if not validate_requirements():
+    files = validate_requirements()
+    if not (files["post_panel"] and files["post_ts"]):
         print("\n[ERROR] Requirements not met. Please import the required data first.")
         exit(1)
     
     print("\n" + "=" * 30)
     
-    # Run the main workflow
-    success = main()
+    # Run the main workflow, reusing the file lists found above
+    success = main(files)
     
     if success:
         print("\n[SUCCESS] Summary creation completed successfully!")
@@ -1,145 +1,177 @@
 # Import Packages
 import os
 import numpy as np
-import pandas as pd
 import polars as pl
 import matplotlib.pyplot as plt
-from hmda_data_manager.core import DATA_DIR
-from scipy import stats
-from pyod.models.knn import KNN
+from hmda_data_manager.core import SILVER_DIR
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import StandardScaler
 from pathlib import Path
 
-os.chdir(Path(__file__).resolve().parent.parent)
 OUTPUT_DIR = Path("output")
-OUTPUT_DIR.mkdir(exist_ok=True)
-
-## Plot Lender Averages
-for column in ["income", "loan_amount", "interest_rate"]:
-    columns = ["activity_year", "lei", column]
-    # Get list of clean parquet files for 2018-2023
-    clean_dir = DATA_DIR / "clean" / "loans"
-    files = [clean_dir / f"{year}_public_lar.parquet" for year in range(2018, 2024) 
-             if (clean_dir / f"{year}_public_lar.parquet").exists()]
-    df = []
-    for file in files:
-        df_a = pl.read_parquet(file, columns=columns)
-        df_a = df_a.filter(pl.col("action_taken") == 1).to_pandas()
-        df_a.loc[df_a[column] == "1111", column] = None
-        df_a[column] = pd.to_numeric(df_a[column], errors="coerce")
-        df_a = df_a.dropna(subset=[column])
-        df_a[f"average_{column}"] = df_a.groupby(["activity_year", "lei"])[
-            column
-        ].transform("mean")
-        df_a["count_observations"] = df_a.groupby(["activity_year", "lei"])[
-            column
-        ].transform("count")
-        df_a = df_a.drop(columns=[column]).drop_duplicates()
-        df.append(df_a)
-        del df_a
-    df = pd.concat(df)
-
-    # Plot Distributions by Year
-    p01 = df[f"average_{column}"].quantile(0.01)
-    p99 = df[f"average_{column}"].quantile(0.99)
-    plt.figure(1)
-    for year in list(df.activity_year.unique()):
-        df_year = df.query(f"activity_year=={year} & {p01}<=average_{column}<{p99}")
-        plt.hist(
-            df_year[f"average_{column}"], bins=100, alpha=0.25, label=year, density=True
+
+
+def lender_averages(lf, columns):
+    """Lazily compute lender-year averages of ``columns`` for originations.
+
+    All columns are aggregated in one pass. Nulls (including the -99999
+    exempt sentinel) are ignored, so ``count_<column>`` is the number of valid
+    observations and ``average_<column>`` is null when a lender-year has none.
+    """
+    return (
+        lf.filter(pl.col("action_taken") == 1)
+        .select(
+            "activity_year",
+            "lei",
+            pl.col(columns).replace(-99999, None),
+        )
+        .group_by(["activity_year", "lei"])
+        .agg(
+            [pl.col(column).mean().alias(f"average_{column}") for column in columns]
+            + [pl.col(column).count().alias(f"count_{column}") for column in columns]
+        )
+    )
+
+
+def main():
+    os.chdir(Path(__file__).resolve().parent.parent)
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
+    # Scan the silver layer for the 2018-2023 snapshot files (file_type=c,
+    # built from {year}_public_lar). Silver columns are already numeric, with
+    # exempt values ("Exempt", or "1111" in coded fields) stored as -99999, and the
+    # partition filters prune directories
+    lf = pl.scan_parquet(SILVER_DIR / "loans" / "post2018", hive_partitioning=True).filter(
+        pl.col("activity_year").is_between(2018, 2023) & (pl.col("file_type") == "c")
+    )
+
+    ## Plot Lender Averages
+    # One read of the files computes all three averages
+    average_columns = ["income", "loan_amount", "interest_rate"]
+    df_averages = (
+        lender_averages(lf, average_columns)
+        .sort("activity_year")
+        .collect(engine="streaming")
+    )
+    for column in average_columns:
+        average = f"average_{column}"
+        # Keep lender-years with at least one valid value for this column
+        df = df_averages.drop_nulls(average)
+
+        # Plot Distributions by Year
+        p01, p99 = df.select(
+            pl.col(average).quantile(0.01, interpolation="linear").alias("p01"),
+            pl.col(average).quantile(0.99, interpolation="linear").alias("p99"),
+        ).row(0)
+        df = df.filter(pl.col(average).is_between(p01, p99, closed="left"))
+        # Every year shares the same 100 bins between the 1st and 99th percentiles
+        edges = np.linspace(p01, p99, 101)
+        # Rows are sorted by year, so each year is one contiguous slice
+        averages = df[average].to_numpy()
+        years, starts = np.unique(df["activity_year"].to_numpy(), return_index=True)
+        ends = np.r_[starts[1:], len(df)]
+        plt.figure(1)
+        for year, start, end in zip(years, starts, ends):
+            density, _ = np.histogram(averages[start:end], bins=edges, density=True)
+            plt.stairs(density, edges, fill=True, alpha=0.25, label=year)
+        plt.legend()
+        plt.xlabel(f"Average {column} for Lender")
+        plt.ylabel("Density")
+        plt.savefig(OUTPUT_DIR / f"average_{column}_by_lender.png", dpi=250)
+        plt.show()
+
+    ## KNN Outlier Example
+    # Import Data
+    columns = [
+        "activity_year",
+        "lei",
+        "income",
+        "loan_amount",
+        "interest_rate",
+        "combined_loan_to_value_ratio",
+        "debt_to_income_ratio",
+        "discount_points",
+        "loan_term",
+        "property_value",
+        "loan_type",
+        "loan_purpose",
+    ]
+    numeric_columns = [
+        "income",
+        "loan_amount",
+        "interest_rate",
+        "combined_loan_to_value_ratio",
+        "debt_to_income_ratio",
+        "discount_points",
+        "loan_term",
+        "property_value",
+    ]
+    # Clean Data: null the -99999 exempt sentinel (silver's encoding of
+    # exempt values) before the frame reaches pandas
+    df = (
+        lf.filter((pl.col("action_taken") == 1) & (pl.col("state_code") == "DC"))
+        .select(columns)
+        .with_columns(
+            pl.col(numeric_columns).replace(-99999, None).cast(pl.Float64)
         )
-    plt.legend()
-    plt.xlabel(f"Average {column} for Lender")
-    plt.ylabel("Density")
-    plt.savefig(OUTPUT_DIR / f"average_{column}_by_lender.png", dpi=250)
+        .collect(engine="streaming")
+        .to_pandas()
+    )
+
+    # Sample Selection
+    df = df.query("loan_term==360 & loan_type==1")
+
+    # Define Classification Columns
+    classification_columns = [
+        "loan_amount",
+        "property_value",
+        "combined_loan_to_value_ratio",
+        "loan_purpose",
+        "activity_year",
+    ]
+
+    # Create Training Data
+    # dropna already returns a new frame, so train on it directly
+    df = df.dropna(subset=classification_columns)
+    # df = df.sample(10000)
+    # float32 halves the memory traffic of the distance computations; HMDA
+    # values (loan amounts up to ~1e7) fit comfortably in its range
+    X_train = np.ascontiguousarray(
+        df[classification_columns].to_numpy(dtype=np.float32)
+    )
+
+    outlier_fraction = 0.005
+    number_neighbors = 15
+
+    # Standardize so no single feature's units dominate the Euclidean distance
+    X_train = StandardScaler().fit_transform(X_train)
+
+    # fit a tree index and query each point's neighbors (the first hit is the
+    # point itself, so ask for one extra and drop it)
+    nn = NearestNeighbors(n_neighbors=number_neighbors + 1, algorithm="ball_tree")
+    nn.fit(X_train)
+    distances, _ = nn.kneighbors(X_train)
+
+    # raw anomaly score: mean distance to the k nearest neighbors
+    anomaly_scores = distances[:, 1:].mean(axis=1)
+
+    # threshold value to consider a datapoint inlier or outlier
+    outlier_threshold = float(np.quantile(anomaly_scores, 1.0 - outlier_fraction))
+
+    # prediction of a datapoint category outlier (1) or inlier (0)
+    y_pred = (anomaly_scores > outlier_threshold).astype(int)
+
+    # Prediction Score Histogram
+    plt.figure(2)
+    plt.hist(anomaly_scores, bins=100, range=(0, outlier_threshold))
+    plt.axvline(x=[outlier_threshold], color="red")
     plt.show()
 
-## PyOD Example
-# Import Data
-columns = [
-    "activity_year",
-    "lei",
-    "income",
-    "loan_amount",
-    "interest_rate",
-    "combined_loan_to_value_ratio",
-    "debt_to_income_ratio",
-    "discount_points",
-    "loan_term",
-    "property_value",
-    "loan_type",
-    "loan_purpose",
-]
-# Get list of clean parquet files for 2018-2023
-clean_dir = DATA_DIR / "clean" / "loans"
-files = [clean_dir / f"{year}_public_lar.parquet" for year in range(2018, 2024) 
-         if (clean_dir / f"{year}_public_lar.parquet").exists()]
-df = []
-for file in files:
-    df_a = pl.read_parquet(file, columns=columns)
-    df_a = df_a.filter(
-        (pl.col("action_taken") == 1) & (pl.col("state_code") == "DC")
-    ).to_pandas()
-    df.append(df_a)
-    del df_a
-df = pd.concat(df)
-
-# Clean Data
-for column in [
-    "income",
-    "loan_amount",
-    "interest_rate",
-    "combined_loan_to_value_ratio",
-    "debt_to_income_ratio",
-    "discount_points",
-    "loan_term",
-    "property_value",
-]:
-    df.loc[df[column] == "1111", column] = None
-    df[column] = pd.to_numeric(df[column], errors="coerce")
-
-# Sample Selection
-df = df.query("loan_term==360 & loan_type==1")
-
-# Define Classification Columns
-classification_columns = [
-    "loan_amount",
-    "property_value",
-    "combined_loan_to_value_ratio",
-    "loan_purpose",
-    "activity_year",
-]
-
-# Create Training Data
-df = df.dropna(subset=classification_columns)
-df_train = df.copy()
-# df_train = df_train.sample(10000)
-X_train = df_train[classification_columns].values
-
-outlier_fraction = 0.005
-number_neighbors = 15
-clf = KNN(contamination=outlier_fraction, n_neighbors=number_neighbors)
-
-# fit the dataset to the model
-clf.fit(X_train)
-
-# predict raw anomaly score
-anomaly_scores = clf.decision_function(X_train)
-
-# prediction of a datapoint category outlier or inlier
-y_pred = clf.predict(X_train)
-
-# threshold value to consider a datapoint inlier or outlier
-outlier_threshold = stats.scoreatpercentile(
-    anomaly_scores, 100 * (1 - outlier_fraction)
-)
-
-# Prediction Score Histogram
-step_size = 10000
-plt.figure(2)
-plt.hist(anomaly_scores, bins=np.arange(0, outlier_threshold + step_size, step_size))
-plt.axvline(x=[outlier_threshold], color="red")
-plt.show()
-
-# Grab Outliers
-outliers = df_train[y_pred == 1]
-score_outliers = df_train[anomaly_scores > outlier_threshold]
+    # Grab Outliers
+    outliers = df[y_pred == 1]
+    score_outliers = df[anomaly_scores > outlier_threshold]
+    return outliers, score_outliers
+
+
+if __name__ == "__main__":
+    main()
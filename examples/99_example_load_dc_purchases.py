@@ -23,7 +23,8 @@ from hmda_data_manager.core import (
 
 # Read from hive-partitioned database (created by example_import_workflow_post2018.py)
 # This demonstrates efficient querying of the partitioned dataset
-df = pl.scan_parquet(SILVER_DIR / "loans" / "post2018")
+# Partition columns come from the directory names, so filters on them prune files
+df = pl.scan_parquet(SILVER_DIR / "loans" / "post2018", hive_partitioning=True)
 df = df.sql('''
 WITH alias AS (
     SELECT *, MIN(file_type) OVER (PARTITION BY activity_year) AS min_file_type
@@ -43,14 +44,24 @@ FROM loans
 GROUP BY activity_year, state_code, county_code
 ORDER BY activity_year, state_code, county_code
 ''',
-table_name = 'loans').collect()
+table_name = 'loans')
+
+# Year and file type combinations selected for each year
+df_file_types = df.select(pl.col("activity_year"), pl.col("file_type")).unique().sort(by=["activity_year", "file_type"])
+
+# Collect the summaries together on the streaming engine so the shared DC scan
+# runs once with bounded memory; only a preview of the loan rows is kept
+df_preview, df_county, df_file_types = pl.collect_all(
+    [df.head(20), df_county, df_file_types],
+    engine="streaming",
+)
 
 # Show the results
-df = df.collect()
-print(df)
+print(df_preview)
+print(df_county)
 
 # Print year and file type combinations
-print(df.select(pl.col("activity_year"), pl.col("file_type")).unique().sort(by=["activity_year", "file_type"]))
+print(df_file_types)
 
 
 df_ts = pl.scan_parquet(
@@ -66,7 +77,7 @@ SELECT * FROM alias
 WHERE min_file_type = file_type
 ''',
 table_name = 'ts')
-df_ts = df_ts.collect()
+df_ts = df_ts.collect(engine="streaming")
 print(df_ts)
 
 df_panel = pl.scan_parquet(
@@ -84,5 +95,5 @@ SELECT * FROM alias
 WHERE min_file_type = file_type
 ''',
 table_name = 'panel')
-df_panel = df_panel.collect()
+df_panel = df_panel.collect(engine="streaming")
 print(df_panel)
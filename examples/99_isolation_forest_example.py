@@ -21,9 +21,7 @@ Detection Method:
 """
 
 from sklearn.ensemble import IsolationForest
-from sklearn.model_selection import train_test_split
 import matplotlib.pyplot as plt
-import pandas as pd
 import polars as pl
 import numpy as np
 from hmda_data_manager.core import SILVER_DIR
@@ -34,9 +32,15 @@ from hmda_data_manager.core import SILVER_DIR
 
 print("Step 1: Loading HMDA data from silver layer...")
 
-# Load silver data for 2020 originations
-# Using snapshot file (file_type=c) for most complete annual data
-data_path = SILVER_DIR / "loans" / "post2018" / "activity_year=2023" / "file_type=b" / "*.parquet"
+# Load silver data for 2023 originations from the one-year file (file_type=b).
+# Partition values are expressed as filters so the planner prunes Hive partitions.
+data_path = SILVER_DIR / "loans" / "post2018"
+activity_year = 2023
+file_type = "b"
+
+# Scan engine: "polars" (default) or "duckdb" (optional dependency; pushes the
+# filters and column projection into DuckDB's parquet reader)
+ENGINE = "polars"
 
 # Define features for anomaly detection
 X_columns = [
@@ -56,22 +60,34 @@ X_columns = [
 ]
 y_columns = ['lei']
 
-# Load with Polars and convert to pandas for sklearn
-dataset_pl = (
-    pl.scan_parquet(data_path)
-    .filter(pl.col("action_taken") == 1)  # Originations only
-    .select(X_columns + y_columns)
-    .collect()
-)
-
-# Replace -99999 values with Nones
-for col in X_columns:
-    dataset_pl = dataset_pl.with_columns(pl.col(col).replace(-99999, None))
-
-# Convert to pandas for sklearn compatibility
-dataset = dataset_pl.to_pandas()
+# Load originations, replacing -99999 values with Nones
+if ENGINE == "duckdb":
+    import duckdb
+
+    query = f"""
+    SELECT {", ".join(X_columns + y_columns)}
+    FROM read_parquet('{data_path / "**" / "*.parquet"}', hive_partitioning = true)
+    WHERE activity_year = {activity_year}
+    AND file_type = '{file_type}'
+    AND action_taken = 1
+    """
+    dataset_pl = duckdb.sql(query).pl().with_columns(
+        [pl.col(col).replace(-99999, None) for col in X_columns]
+    )
+else:
+    dataset_pl = (
+        pl.scan_parquet(data_path, hive_partitioning=True)
+        .filter(
+            (pl.col("activity_year") == activity_year)
+            & (pl.col("file_type") == file_type)
+            & (pl.col("action_taken") == 1)  # Originations only
+        )
+        .with_columns([pl.col(col).replace(-99999, None) for col in X_columns])
+        .select(X_columns + y_columns)
+        .collect()
+    )
 
-print(f"Loaded {len(dataset):,} originated loans from 2024")
+print(f"Loaded {len(dataset_pl):,} originated loans from {activity_year}")
 
 # =============================================================================
 # Step 2: Prepare Data for Modeling
@@ -79,30 +95,23 @@ print(f"Loaded {len(dataset):,} originated loans from 2024")
 
 print("\nStep 2: Preparing data for modeling...")
 
-# Convert to numeric types (handle any remaining string values)
-for col in X_columns:
-    dataset[col] = pd.to_numeric(dataset[col], errors='coerce')
-
-# Fill missing values with the median of each column
-for col in X_columns:
-    dataset[col] = dataset[col].fillna(dataset[col].median())
-
-# Drop any remaining missing values
-dataset = dataset.dropna(subset=X_columns)
+# Convert to numeric types (handle any remaining string values), fill missing
+# values with the median of each column, and drop any remaining missing values
+dataset_pl = dataset_pl.with_columns(
+    [
+        pl.col(col)
+        .cast(pl.Float32, strict=False)
+        .fill_null(pl.col(col).cast(pl.Float32, strict=False).median())
+        .alias(col)
+        for col in X_columns
+    ]
+).drop_nulls(subset=X_columns)
 
-print(f"After cleaning: {len(dataset):,} loans")
+print(f"After cleaning: {len(dataset_pl):,} loans")
 
-# Set X (features) and y (LEI for grouping)
-X = dataset[X_columns].values
-y = dataset[y_columns].values
-
-# Split the data into training and testing sets
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.3, random_state=42
-)
-
-print(f"Training set: {len(X_train):,} loans")
-print(f"Test set: {len(X_test):,} loans")
+# Set X (features) directly from Polars; LEIs stay in dataset_pl for grouping.
+# Features are float32, which IsolationForest uses internally anyway.
+X = dataset_pl.select(X_columns).to_numpy()
 
 # =============================================================================
 # Step 3: Fit Isolation Forest Model
@@ -110,7 +119,8 @@ print(f"Test set: {len(X_test):,} loans")
 
 print("\nStep 3: Fitting Isolation Forest model...")
 
-# Initialize and fit the model
+# Initialize and fit the model on the full dataset. Each tree already draws
+# its own subsample (max_samples), so no separate train/test split is needed.
 # contamination=0.0025 means we expect 0.25% of the data to be anomalies
 clf = IsolationForest(
     contamination=0.0025,
@@ -119,7 +129,7 @@ clf = IsolationForest(
     n_estimators=100
 )
 
-clf.fit(X_train)
+clf.fit(X)
 print("Model fitted successfully")
 
 # =============================================================================
@@ -129,21 +139,16 @@ print("Model fitted successfully")
 print("\nStep 4: Detecting anomalies...")
 
 # Predict anomalies (-1 = anomaly, 1 = normal)
-y_pred_train = clf.predict(X_train)
-y_pred_test = clf.predict(X_test)
+y_pred = clf.predict(X)
 
 # Calculate anomaly scores (lower = more anomalous)
-y_train_scores = clf.decision_function(X_train)
-y_test_scores = clf.decision_function(X_test)
+scores = clf.decision_function(X)
 
 # Print summary statistics
-train_anomalies = (y_pred_train == -1).sum()
-test_anomalies = (y_pred_test == -1).sum()
+n_anomalies = (y_pred == -1).sum()
 
-print(f"\nTraining set anomalies: {train_anomalies:,} ({train_anomalies/len(y_pred_train)*100:.2f}%)")
-print(f"Test set anomalies: {test_anomalies:,} ({test_anomalies/len(y_pred_test)*100:.2f}%)")
-print(f"Mean anomaly score (train): {np.mean(y_train_scores):.4f}")
-print(f"Mean anomaly score (test): {np.mean(y_test_scores):.4f}")
+print(f"\nAnomalies: {n_anomalies:,} ({n_anomalies/len(y_pred)*100:.2f}%)")
+print(f"Mean anomaly score: {np.mean(scores):.4f}")
 
 # =============================================================================
 # Step 5: Visualize Anomaly Score Distribution
@@ -151,46 +156,34 @@ print(f"Mean anomaly score (test): {np.mean(y_test_scores):.4f}")
 
 print("\nStep 5: Generating visualizations...")
 
-# Plot the distribution of outlier scores
-fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+# Plot the distribution of outlier scores from precomputed bin counts,
+# sharing one set of bin edges between normal and anomalous loans
+fig, ax = plt.subplots(figsize=(6, 6))
 
-axes[0].hist(
-    y_train_scores[y_pred_train == 1],
-    bins=50,
-    color='blue',
-    alpha=0.7,
-    label='Train Scores (Normal)'
-)
-axes[0].hist(
-    y_train_scores[y_pred_train == -1],
-    bins=50,
-    color='red',
-    alpha=0.7,
-    label='Train Scores (Anomalies)'
-)
-axes[0].set_title('Train Anomaly Scores')
-axes[0].set_xlabel('Anomaly Score')
-axes[0].set_ylabel('Frequency')
-axes[0].legend()
-
-axes[1].hist(
-    y_test_scores[y_pred_test == 1],
-    bins=50,
+edges = np.histogram_bin_edges(scores, bins=50)
+normal_counts, _ = np.histogram(scores[y_pred == 1], bins=edges)
+anomaly_counts, _ = np.histogram(scores[y_pred == -1], bins=edges)
+
+ax.stairs(
+    normal_counts,
+    edges,
+    fill=True,
     color='blue',
     alpha=0.7,
-    label='Test Scores (Normal)'
+    label='Scores (Normal)'
 )
-axes[1].hist(
-    y_test_scores[y_pred_test == -1],
-    bins=50,
+ax.stairs(
+    anomaly_counts,
+    edges,
+    fill=True,
     color='red',
     alpha=0.7,
-    label='Test Scores (Anomalies)'
+    label='Scores (Anomalies)'
 )
-axes[1].set_title('Test Anomaly Scores')
-axes[1].set_xlabel('Anomaly Score')
-axes[1].set_ylabel('Frequency')
-axes[1].legend()
+ax.set_title('Anomaly Scores')
+ax.set_xlabel('Anomaly Score')
+ax.set_ylabel('Frequency')
+ax.legend()
 
 plt.tight_layout()
 
@@ -198,84 +191,51 @@ plt.tight_layout()
 # Step 6: Scatter Plots of Anomalies
 # =============================================================================
 
-def create_scatter_plots(X1, y1, title1, X2, y2, title2):
+def create_scatter_plots(X, y, title):
     """Create scatter plots comparing features for normal vs anomalous loans."""
-    fig, axes = plt.subplots(nrows=2, ncols=2, figsize=(12, 6), sharex='col')
+    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(12, 6))
 
     # Set limits for figures by truncating 1st and 99th percentiles
-    x0_min = np.quantile(X1[:, 0], .01)
-    x0_max = np.quantile(X1[:, 0], .99)
-    x1_min = np.quantile(X1[:, 1], .01)
-    x1_max = np.quantile(X1[:, 1], .99)
-    x2_min = np.quantile(X1[:, 2], .01)
-    x2_max = np.quantile(X1[:, 2], .99)
-    x3_min = np.quantile(X1[:, 3], .01)
-    x3_max = np.quantile(X1[:, 3], .99)
-
-    # Interest Rate vs Loan Amount (training)
-    axes[0, 0].scatter(
-        X1[y1 == 1, 0], X1[y1 == 1, 1],
-        color='green', label='Normal', s=1, alpha=0.1
-    )
-    axes[0, 0].scatter(
-        X1[y1 == -1, 0], X1[y1 == -1, 1],
-        color='red', label='Anomaly', s=1, alpha=0.1
-    )
-    axes[0, 0].set_title(title1)
-    axes[0, 0].set_xlim(x0_min, x0_max)
-    axes[0, 0].set_ylim(x1_min, x1_max)
-    axes[0, 0].legend()
-
-    # Interest Rate vs Loan Amount (test)
-    axes[1, 0].scatter(
-        X2[y2 == 1, 0], X2[y2 == 1, 1],
-        color='green', label='Normal', s=1, alpha=0.1
-    )
-    axes[1, 0].scatter(
-        X2[y2 == -1, 0], X2[y2 == -1, 1],
-        color='red', label='Anomaly', s=1, alpha=0.1
-    )
-    axes[1, 0].set_title(title2)
-    axes[1, 0].set_xlim(x0_min, x0_max)
-    axes[1, 0].set_ylim(x1_min, x1_max)
-    axes[1, 0].legend()
-
-    # Income vs CLTV (training)
-    axes[0, 1].scatter(
-        X1[y1 == 1, 2], X1[y1 == 1, 3],
+    # (one quantile pass over the four plotted features)
+    lo, hi = np.quantile(X[:, :4], [.01, .99], axis=0)
+
+    # Boolean masks for normal vs anomalous loans, computed once
+    normal = y.ravel() == 1
+    anomaly = ~normal
+
+    # Interest Rate vs Loan Amount
+    axes[0].scatter(
+        X[normal, 0], X[normal, 1],
         color='green', label='Normal', s=1, alpha=0.1
     )
-    axes[0, 1].scatter(
-        X1[y1 == -1, 2], X1[y1 == -1, 3],
+    axes[0].scatter(
+        X[anomaly, 0], X[anomaly, 1],
         color='red', label='Anomaly', s=1, alpha=0.1
     )
-    axes[0, 1].set_title(title1)
-    axes[0, 1].set_xlim(x2_min, x2_max)
-    axes[0, 1].set_ylim(x3_min, x3_max)
-    axes[0, 1].legend()
-
-    # Income vs CLTV (test)
-    axes[1, 1].scatter(
-        X2[y2 == 1, 2], X2[y2 == 1, 3],
+    axes[0].set_title(title)
+    axes[0].set_xlim(lo[0], hi[0])
+    axes[0].set_ylim(lo[1], hi[1])
+    axes[0].legend()
+
+    # Income vs CLTV
+    axes[1].scatter(
+        X[normal, 2], X[normal, 3],
         color='green', label='Normal', s=1, alpha=0.1
     )
-    axes[1, 1].scatter(
-        X2[y2 == -1, 2], X2[y2 == -1, 3],
+    axes[1].scatter(
+        X[anomaly, 2], X[anomaly, 3],
         color='red', label='Anomaly', s=1, alpha=0.1
     )
-    axes[1, 1].set_title(title2)
-    axes[1, 1].set_xlim(x2_min, x2_max)
-    axes[1, 1].set_ylim(x3_min, x3_max)
-    axes[1, 1].legend()
+    axes[1].set_title(title)
+    axes[1].set_xlim(lo[2], hi[2])
+    axes[1].set_ylim(lo[3], hi[3])
+    axes[1].legend()
 
     plt.suptitle('Isolation Forest Anomaly Detection', fontsize=16)
     plt.tight_layout()
 
 # Create scatter plots
-create_scatter_plots(
-    X_train, y_pred_train, 'Training Data',
-    X_test, y_pred_test, 'Test Data'
-)
+create_scatter_plots(X, y_pred, 'All Loans')
 
 # =============================================================================
 # Step 7: Analyze Anomalies by LEI
@@ -283,28 +243,21 @@ create_scatter_plots(
 
 print("\nStep 7: Analyzing anomalies by lender (LEI)...")
 
-# Put data back into DataFrame for analysis
-X_train_df = pd.DataFrame(X_train, columns=X_columns)
-y_train_df = pd.DataFrame(y_train, columns=y_columns)
-train_df = pd.concat([X_train_df, y_train_df], axis=1)
-train_df['anomaly'] = y_pred_train
-train_df['anomaly_score'] = y_train_scores
-
-X_test_df = pd.DataFrame(X_test, columns=X_columns)
-y_test_df = pd.DataFrame(y_test, columns=y_columns)
-test_df = pd.concat([X_test_df, y_test_df], axis=1)
-test_df['anomaly'] = y_pred_test
-test_df['anomaly_score'] = y_test_scores
-
-# Combine train and test
-train_df['i_Train'] = 1
-combined_df = pd.concat([train_df, test_df], ignore_index=True)
-combined_df['i_Train'] = combined_df['i_Train'].fillna(0)
-
-# Calculate LEI-level statistics
-combined_df['lei_anomaly_score'] = combined_df.groupby(['lei'])['anomaly_score'].transform('mean')
-combined_df['lei_anomaly_count'] = combined_df.groupby(['lei'])['anomaly'].transform(lambda x: (x == -1).sum())
-combined_df['count_lei'] = combined_df.groupby(['lei'])['anomaly'].transform('count')
+# Attach predictions to the cleaned data and calculate LEI-level statistics
+# in a single Polars window pass
+combined_df = (
+    dataset_pl.select(X_columns + y_columns)
+    .with_columns(
+        pl.Series('anomaly', y_pred),
+        pl.Series('anomaly_score', scores),
+    )
+    .with_columns(
+        pl.col('anomaly_score').mean().over('lei').alias('lei_anomaly_score'),
+        (pl.col('anomaly') == -1).sum().over('lei').alias('lei_anomaly_count'),
+        pl.col('anomaly').count().over('lei').alias('count_lei'),
+    )
+    .to_pandas()
+)
 
 # Get LEI summary
 lei_df = combined_df[['lei', 'lei_anomaly_score', 'lei_anomaly_count', 'count_lei']].drop_duplicates()
@@ -330,8 +283,8 @@ anomalous_loans = anomalous_loans.reset_index(drop=True)
 print("\n" + "="*60)
 print("Analysis Complete!")
 print("="*60)
-print(f"\nTotal loans analyzed: {len(dataset):,}")
-print(f"Anomalous loans detected: {train_anomalies + test_anomalies:,}")
+print(f"\nTotal loans analyzed: {len(dataset_pl):,}")
+print(f"Anomalous loans detected: {n_anomalies:,}")
 print(f"Lenders with systematic issues: {len(anomalous_leis)}")
 print(f"\nDetailed findings documented in:")
 print("  - docs/DATA_QUALITY_ISSUES.md")
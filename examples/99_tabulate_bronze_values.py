@@ -16,17 +16,50 @@ Usage:
     python examples/tabulate_bronze_values.py
 
 Then select the period and dataset interactively.
+
+The per-column summaries are saved to ``silver/_tab_report.parquet``. On a
+rerun, columns whose source bronze files are unchanged (same names, sizes and
+modification times) are read from the report instead of being rescanned.
 """
 
+import hashlib
 import polars as pl
 from pathlib import Path
-from hmda_data_manager.core.config import get_medallion_dir
+from hmda_data_manager.core.config import SILVER_DIR, get_medallion_dir
 
 # Configuration
 AVAILABLE_PERIODS = {
-    "pre2007": {"years": range(1990, 2007), "datasets": ["loans"]},
-    "period_2007_2017": {"years": range(2007, 2018), "datasets": ["loans"]},
-    "post2018": {"years": range(2018, 2025), "datasets": ["loans", "panel", "transmissal_series"]},
+    "pre2007": {
+        "years": range(1990, 2007),
+        "datasets": ["loans"],
+        "workflow": "examples/04_example_import_workflow_pre2007.py",
+    },
+    "period_2007_2017": {
+        "years": range(2007, 2018),
+        "datasets": ["loans"],
+        "workflow": "examples/03_example_import_workflow_2007_2017.py",
+    },
+    "post2018": {
+        "years": range(2018, 2025),
+        "datasets": ["loans", "panel", "transmissal_series"],
+        "workflow": "examples/02_example_import_workflow_post2018.py",
+    },
+}
+
+REPORT_PATH = SILVER_DIR / "_tab_report.parquet"
+
+REPORT_SCHEMA = {
+    "period": pl.String,
+    "dataset": pl.String,
+    "column": pl.String,
+    "file_mtime_hash": pl.String,
+    "n_unique": pl.Int64,
+    "total_count": pl.Int64,
+    "is_integer_like": pl.Boolean,
+    "is_float_like": pl.Boolean,
+    "classification": pl.String,
+    "non_numeric_examples": pl.String,
+    "top_values": pl.List(pl.Struct({"value": pl.String, "count": pl.Int64})),
 }
 
 SKIP_COLUMNS = [
@@ -37,6 +70,18 @@ SKIP_COLUMNS = [
 ]
 
 
+PERIOD_MENU = {"1": "pre2007", "2": "period_2007_2017", "3": "post2018"}
+
+
+def prompt_choice(prompt: str, choices: dict[str, str]) -> str:
+    """Prompt until the user enters one of the menu keys and return its value."""
+    while True:
+        choice = input(prompt).strip()
+        if choice in choices:
+            return choices[choice]
+        print(f"Invalid choice. Please enter 1-{len(choices)}.")
+
+
 def get_user_selection():
     """Prompt user to select period and dataset."""
     print("="*80)
@@ -47,19 +92,7 @@ def get_user_selection():
     print("  2. period_2007_2017 (2007-2017)")
     print("  3. post2018 (2018-2024)")
 
-    while True:
-        choice = input("\nSelect period (1-3): ").strip()
-        if choice == "1":
-            period = "pre2007"
-            break
-        elif choice == "2":
-            period = "period_2007_2017"
-            break
-        elif choice == "3":
-            period = "post2018"
-            break
-        else:
-            print("Invalid choice. Please enter 1, 2, or 3.")
+    period = prompt_choice("\nSelect period (1-3): ", PERIOD_MENU)
 
     # Get available datasets for this period
     available_datasets = AVAILABLE_PERIODS[period]["datasets"]
@@ -69,26 +102,26 @@ def get_user_selection():
         print(f"\nDataset: {dataset}")
     else:
         print(f"\nAvailable datasets for {period}:")
-        for i, ds in enumerate(available_datasets, 1):
-            print(f"  {i}. {ds}")
-
-        while True:
-            choice = input(f"\nSelect dataset (1-{len(available_datasets)}): ").strip()
-            try:
-                idx = int(choice) - 1
-                if 0 <= idx < len(available_datasets):
-                    dataset = available_datasets[idx]
-                    break
-                else:
-                    print(f"Invalid choice. Please enter 1-{len(available_datasets)}.")
-            except ValueError:
-                print(f"Invalid choice. Please enter 1-{len(available_datasets)}.")
+        dataset_menu = {str(i): ds for i, ds in enumerate(available_datasets, 1)}
+        for key, ds in dataset_menu.items():
+            print(f"  {key}. {ds}")
+
+        dataset = prompt_choice(
+            f"\nSelect dataset (1-{len(available_datasets)}): ", dataset_menu
+        )
 
     return period, dataset
 
 
-def load_bronze_data(period: str, dataset: str) -> pl.LazyFrame | None:
-    """Load all bronze files for the given period and dataset."""
+def load_bronze_data(
+    period: str, dataset: str
+) -> tuple[pl.LazyFrame, dict[str, str]] | None:
+    """Load all bronze files for the given period and dataset.
+
+    Returns the lazy scan and a fingerprint per column, or None when no bronze
+    files exist. Every column's fingerprint covers the full file list, since
+    files without the column still contribute null rows to its counts.
+    """
     bronze_folder = get_medallion_dir("bronze", dataset, period)
 
     # Get all parquet files
@@ -99,99 +132,221 @@ def load_bronze_data(period: str, dataset: str) -> pl.LazyFrame | None:
 
     print(f"\nFound {len(parquet_files)} bronze files in: {bronze_folder}")
 
-    # Load all files as a single LazyFrame
-    lf_list = [pl.scan_parquet(str(f)) for f in parquet_files]
-    lf = pl.concat(lf_list, how="diagonal_relaxed")
+    # Column sets differ across years, so union the schemas from the parquet
+    # footers (bronze columns are all strings) and scan every file as one
+    # source; columns missing from a file are filled with nulls
+    schema = {}
+    sources = []
+    for f in parquet_files:
+        stat = f.stat()
+        sources.append(f"{f.name}:{stat.st_size}:{stat.st_mtime_ns}")
+        for name, dtype in pl.read_parquet_schema(f).items():
+            schema.setdefault(name, dtype)
+
+    lf = pl.scan_parquet(parquet_files, schema=schema, missing_columns="insert")
+
+    fingerprint = hashlib.sha256("\n".join(sources).encode()).hexdigest()
+    fingerprints = {name: fingerprint for name in schema}
+
+    return lf, fingerprints
 
-    return lf
 
+def load_cached_report(period: str, dataset: str) -> pl.DataFrame:
+    """Return the saved report rows for this period and dataset (may be empty)."""
+    if not REPORT_PATH.exists():
+        return pl.DataFrame(schema=REPORT_SCHEMA)
+    return pl.read_parquet(REPORT_PATH).filter(
+        (pl.col("period") == period) & (pl.col("dataset") == dataset)
+    )
 
-def tabulate_values(lf: pl.LazyFrame, period: str, dataset: str):
-    """Tabulate unique values for each column."""
-    # Get schema
+
+def save_report(report: pl.DataFrame, period: str, dataset: str) -> None:
+    """Replace this period and dataset's rows in the saved report."""
+    if REPORT_PATH.exists():
+        others = pl.read_parquet(REPORT_PATH).filter(
+            (pl.col("period") != period) | (pl.col("dataset") != dataset)
+        )
+        report = pl.concat([others, report])
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so an interrupted run keeps the old report
+    tmp_path = REPORT_PATH.with_suffix(".parquet.tmp")
+    report.write_parquet(tmp_path)
+    tmp_path.replace(REPORT_PATH)
+
+
+def profile_columns(lf: pl.LazyFrame, columns: list[str]) -> list[dict]:
+    """Compute value counts and type classification for ``columns``."""
     schema = lf.collect_schema()
-    columns = schema.names()
+    lf = lf.select(columns)
+
+    # Build one value-count query per column and collect them together, so
+    # Polars scans the bronze files once and runs the aggregations in parallel
+    queries = [
+        lf.group_by(col)
+        .agg(pl.len().alias("count"))
+        .sort("count", descending=True)
+        .head(50)  # Limit to top 50 values
+        for col in columns
+    ]
+
+    # Per-column type probes over the full column: a value is integer-/float-
+    # like when Polars can parse it, so the probes share the same scan. Only
+    # string columns need probing; other dtypes are read from the schema.
+    string_columns = [col for col in columns if schema[col] == pl.String]
+    type_checks = [
+        lf.select(
+            (pl.col(col).cast(pl.Int64, strict=False).is_not_null() | pl.col(col).is_null())
+            .all()
+            .alias("is_integer_like"),
+            (pl.col(col).cast(pl.Float64, strict=False).is_not_null() | pl.col(col).is_null())
+            .all()
+            .alias("is_float_like"),
+        )
+        for col in string_columns
+    ]
+    # Examples of unparseable values come from the same full-column probe, so
+    # a column classified non-numeric always has some to show
+    example_checks = [
+        lf.select(col)
+        .filter(
+            pl.col(col).is_not_null()
+            & pl.col(col).cast(pl.Float64, strict=False).is_null()
+        )
+        .unique(maintain_order=True)
+        .head(5)
+        for col in string_columns
+    ]
+    results = pl.collect_all(queries + type_checks + example_checks)
+    value_counts = results[: len(columns)]
+    n_string = len(string_columns)
+    type_results = results[len(columns) : len(columns) + n_string]
+    example_results = results[len(columns) + n_string :]
+    type_flags = {col: flags.row(0) for col, flags in zip(string_columns, type_results)}
+    examples = {
+        col: frame[col].to_list() for col, frame in zip(string_columns, example_results)
+    }
+
+    rows = []
+    for col, unique_df in zip(columns, value_counts):
+        is_integer_like, is_float_like = type_flags.get(
+            col, (schema[col].is_integer(), schema[col].is_numeric())
+        )
+
+        # Classify the column
+        non_null_values = unique_df.filter(pl.col(col).is_not_null())[col]
+        non_numeric = []
+        if not len(non_null_values):
+            classification = "all null"
+        elif is_integer_like:
+            classification = "integer"
+        elif is_float_like:
+            classification = "float"
+        else:
+            classification = "non-numeric"
+            non_numeric = examples.get(col, [])
+
+        rows.append(
+            {
+                "column": col,
+                "n_unique": len(unique_df),
+                "total_count": unique_df["count"].sum(),
+                "is_integer_like": is_integer_like,
+                "is_float_like": is_float_like,
+                "classification": classification,
+                "non_numeric_examples": ", ".join(non_numeric),
+                "top_values": unique_df.select(
+                    pl.col(col).cast(pl.Utf8).alias("value"),
+                    pl.col("count").cast(pl.Int64),
+                ).to_dicts(),
+            }
+        )
+
+    return rows
+
+
+def tabulate_values(
+    lf: pl.LazyFrame, period: str, dataset: str, fingerprints: dict[str, str]
+) -> pl.DataFrame:
+    """Tabulate unique values for each column and return a classification report.
+
+    Columns whose fingerprint matches the saved report are reused; the rest
+    are profiled in one scan and the report is updated on disk.
+    """
+    # Drop skipped columns up front; the projection is pushed into the parquet
+    # reader, so their column chunks are never read or decoded
+    columns = [col for col in lf.collect_schema().names() if col not in SKIP_COLUMNS]
 
     print(f"\nTotal columns: {len(columns)}")
 
-    # For each column, collect unique values (limited to first 50 for display)
+    cached = load_cached_report(period, dataset).filter(
+        pl.col("column").is_in(columns)
+        & (
+            pl.col("file_mtime_hash")
+            == pl.col("column").replace_strict(fingerprints, default=None)
+        )
+    )
+    rows = {row["column"]: row for row in cached.iter_rows(named=True)}
+
+    # Top-50 counts cannot be merged across files, so a column with any
+    # changed source file is rescanned in full (only that column is read)
+    stale_columns = [col for col in columns if col not in rows]
+    print(
+        f"Reusing {len(rows)} profiled columns from {REPORT_PATH}; "
+        f"profiling {len(stale_columns)}"
+    )
+    if stale_columns:
+        for row in profile_columns(lf, stale_columns):
+            rows[row["column"]] = {
+                "period": period,
+                "dataset": dataset,
+                "file_mtime_hash": fingerprints[row["column"]],
+                **row,
+            }
+
+    report = pl.DataFrame([rows[col] for col in columns], schema=REPORT_SCHEMA)
+    if stale_columns:
+        save_report(report, period, dataset)
+
+    # For each column, show the most common values (limited to first 50)
     print("\n" + "="*80)
     print("UNIQUE VALUES BY COLUMN")
     print("="*80)
 
-    for col in columns:
-        if col in SKIP_COLUMNS:
-            continue
-        print(f"\n{col}:")
+    for row in report.iter_rows(named=True):
+        print(f"\n{row['column']}:")
         print("-" * 80)
 
-        # Get unique values and counts
-        unique_df = (
-            lf.select(pl.col(col))
-            .group_by(col)
-            .agg(pl.len().alias("count"))
-            .sort("count", descending=True)
-            .head(50)  # Limit to top 50 values
-            .collect()
-        )
-
-        n_unique = len(unique_df)
-        total_count = unique_df["count"].sum()
-
         # Display values
-        print(f"Unique values: {n_unique} (showing up to 50 most common)")
-        print(f"Total rows for these values: {total_count:,}\n")
-
-        # Format output
-        for row in unique_df.iter_rows(named=True):
-            value = row[col]
-            count = row["count"]
-
-            # Display value (handle None/null)
-            if value is None:
-                display_val = "NULL"
-            else:
-                display_val = str(value)
-
-            print(f"  {display_val:30s} {count:>15,}")
-
-        # Check if all non-null values are numeric strings (potential integer column)
-        non_null_values = unique_df.filter(pl.col(col).is_not_null())[col].to_list()
-
-        if non_null_values:
-            # Check if all values are numeric (allowing leading zeros, negative signs, decimals)
-            all_integer_like = all(
-                v.lstrip('-').isdigit() if isinstance(v, str) else False
-                for v in non_null_values
-            )
+        print(f"Unique values: {row['n_unique']} (showing up to 50 most common)")
+        print(f"Total rows for these values: {row['total_count']:,}\n")
 
-            all_float_like = all(
-                v.lstrip('-').replace('.', '', 1).replace('e', '', 1).replace('E', '', 1).replace('+', '', 1).isdigit()
-                if isinstance(v, str) else False
-                for v in non_null_values
-            )
+        # Format output as one block (nulls displayed as NULL)
+        print("\n".join(
+            f"  {'NULL' if value['value'] is None else value['value']:30s} {value['count']:>15,}"
+            for value in row["top_values"]
+        ))
 
-            if all_integer_like:
-                print(f"\n  ✅ CANDIDATE FOR INTEGER CONVERSION (all non-null values are numeric)")
-            elif all_float_like:
-                print(f"\n  ✅ CANDIDATE FOR FLOAT CONVERSION (all non-null values are numeric/decimal)")
-            else:
-                # Show non-numeric examples
-                non_numeric = [
-                    v for v in non_null_values
-                    if not (isinstance(v, str) and v.lstrip('-').replace('.', '', 1).isdigit())
-                ][:5]
-                if non_numeric:
-                    print(f"\n  ❌ CONTAINS NON-NUMERIC VALUES: {non_numeric}")
+    print("\n" + "="*80)
+    print("COLUMN CLASSIFICATION REPORT")
+    print("="*80)
+    with pl.Config(tbl_rows=-1, fmt_str_lengths=60):
+        print(
+            report.select(
+                "column", "n_unique", "total_count", "classification", "non_numeric_examples"
+            )
+        )
 
     print("\n" + "="*80)
     print("TABULATION COMPLETE")
     print("="*80)
+    print(f"\nReport saved to: {REPORT_PATH}")
     print("\nNext steps:")
-    print("  - Columns marked ✅ can be safely converted to Int64/Float64 in silver layer")
-    print("  - Columns marked ❌ need special handling or should remain as String")
+    print("  - Columns classified integer/float can be safely converted to Int64/Float64 in silver layer")
+    print("  - Columns classified non-numeric need special handling or should remain as String")
     print("  - Check config.py for existing column type lists")
 
+    return report
+
 
 def main():
     """Main entry point."""
@@ -199,17 +354,12 @@ def main():
     period, dataset = get_user_selection()
 
     # Load bronze data
-    lf = load_bronze_data(period, dataset)
+    bronze = load_bronze_data(period, dataset)
 
-    if lf is None:
+    if bronze is None:
         print(f"\n❌ Error: No bronze files found for {period} / {dataset}")
         print(f"\nPlease run the import workflow first:")
-        if period == "pre2007":
-            print(f"  python examples/04_example_import_workflow_pre2007.py")
-        elif period == "period_2007_2017":
-            print(f"  python examples/03_example_import_workflow_2007_2017.py")
-        else:
-            print(f"  python examples/02_example_import_workflow_post2018.py")
+        print(f"  python {AVAILABLE_PERIODS[period]['workflow']}")
         return
 
     print("\n" + "="*80)
@@ -217,7 +367,8 @@ def main():
     print("="*80)
 
     # Tabulate values
-    tabulate_values(lf, period, dataset)
+    lf, fingerprints = bronze
+    tabulate_values(lf, period, dataset, fingerprints)
 
 
 if __name__ == "__main__":
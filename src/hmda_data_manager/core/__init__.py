@@ -58,6 +58,7 @@ from .download import (
     download_zip_files_from_url,
     download_hmda_files,
     determine_raw_subfolder,
+    create_download_session,
 )
 
 __all__ = [
@@ -94,5 +95,6 @@ __all__ = [
     "download_zip_files_from_url",
     "download_hmda_files",
     "determine_raw_subfolder",
+    "create_download_session",
 ]
 
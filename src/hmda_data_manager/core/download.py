@@ -23,16 +23,21 @@ Dependencies:
 - Requests (for file downloads)
 """
 
+import json
 import logging
 import re
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -41,6 +46,36 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
+
+
+def create_download_session() -> requests.Session:
+    """
+    Create a keep-alive HTTP session for downloading HMDA files.
+
+    Reusing one session across files keeps connections to the CFPB host open,
+    so repeated downloads skip the TCP/TLS handshake. Transient failures
+    (connection errors, 429 and 5xx responses) are retried with backoff.
+
+    Returns
+    -------
+    requests.Session
+        Session with a pooled, retrying adapter and the download User-Agent
+    """
+    retries = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET"],
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries)
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 def determine_raw_subfolder(file_name: str) -> str:
     """
@@ -104,6 +139,51 @@ def determine_raw_subfolder(file_name: str) -> str:
     return "misc"
 
 
+def _metadata_path(file_path: Path) -> Path:
+    """Return the sidecar path holding cached HTTP validators for a download."""
+    return file_path.with_name(file_path.name + ".meta.json")
+
+
+def _conditional_request_headers(file_path: Path) -> dict[str, str]:
+    """
+    Build conditional request headers from a download's sidecar metadata.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path to the previously downloaded file
+
+    Returns
+    -------
+    dict[str, str]
+        ``If-None-Match``/``If-Modified-Since`` headers for the cached ETag and
+        Last-Modified values; empty if no usable sidecar exists
+    """
+    try:
+        metadata = json.loads(_metadata_path(file_path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+    headers = {}
+    if metadata.get("etag"):
+        headers["If-None-Match"] = metadata["etag"]
+    if metadata.get("last_modified"):
+        headers["If-Modified-Since"] = metadata["last_modified"]
+    return headers
+
+
+def _write_download_metadata(file_path: Path, response_headers) -> None:
+    """Cache the ETag and Last-Modified validators of a completed download."""
+    metadata = {
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+    }
+    try:
+        _metadata_path(file_path).write_text(json.dumps(metadata))
+    except OSError as e:
+        logger.warning("Could not write download metadata for %s: %s", file_path, e)
+
+
 def download_zip_files_from_url(
     page_url: str,
     destination_folder: str,
@@ -113,6 +193,8 @@ def download_zip_files_from_url(
     download_pipes: bool = False,
     download_all: bool = False,
     overwrite_mode: str = "skip",
+    session: requests.Session | None = None,
+    driver_path: str | None = None,
 ) -> None:
     """
     Find all ZIP links on a webpage (after JavaScript rendering) and download
@@ -142,8 +224,18 @@ def download_zip_files_from_url(
         Behavior when destination file exists. Options:
         - 'skip' (default): do not re-download existing files
         - 'always': always re-download and overwrite existing files
-        - 'if_newer': re-download if server Last-Modified is newer than local file
+        - 'if_newer': re-download if the server copy changed since the last
+          download, checked with a conditional request against the ETag and
+          Last-Modified values cached in ``<file>.meta.json`` (falls back to
+          comparing Last-Modified with the local file time)
         - 'if_size_diff': re-download if server Content-Length differs from local file size
+    session : requests.Session, optional
+        HTTP session used for the file requests. Pass one session across calls
+        to reuse its connections; by default a new session from
+        ``create_download_session`` is used for this page.
+    driver_path : str, optional
+        Path to an installed ChromeDriver. By default webdriver-manager
+        installs (or finds the cached) driver for this call.
 
     Returns
     -------
@@ -175,6 +267,9 @@ def download_zip_files_from_url(
         dest_path = Path(destination_folder)
         dest_path.mkdir(parents=True, exist_ok=True)
 
+        if session is None:
+            session = create_download_session()
+
         # Set up the Selenium WebDriver
         chrome_options = Options()
         chrome_options.add_argument("--headless")  # Run Chrome in headless mode
@@ -182,7 +277,9 @@ def download_zip_files_from_url(
         chrome_options.add_argument("--disable-dev-shm-usage")
 
         # Use webdriver-manager to download and manage the ChromeDriver
-        service = ChromeService(ChromeDriverManager().install())
+        if driver_path is None:
+            driver_path = ChromeDriverManager().install()
+        service = ChromeService(driver_path)
         driver = webdriver.Chrome(service=service, options=chrome_options)
 
         logger.info("Fetching content from URL with Selenium: %s", page_url)
@@ -248,25 +345,34 @@ def download_zip_files_from_url(
                     "if_size_diff",
                 ]:
                     try:
-                        headers = {
-                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
-                        }
-                        head_resp = requests.head(
+                        headers = {}
+                        if overwrite_mode.lower() == "if_newer":
+                            headers = _conditional_request_headers(file_path)
+                        head_resp = session.head(
                             file_url, headers=headers, allow_redirects=True, timeout=30
                         )
                         head_resp.raise_for_status()
 
-                        if overwrite_mode.lower() == "if_newer":
+                        # 304 Not Modified: server copy matches the cached validators
+                        if head_resp.status_code == 304:
+                            pass
+                        elif overwrite_mode.lower() == "if_newer":
+                            # Any other reply to a conditional request means the
+                            # cached validators no longer match
+                            if headers:
+                                need_download = True
                             last_mod = head_resp.headers.get("Last-Modified")
-                            if last_mod is not None:
+                            if not need_download and last_mod is not None:
                                 try:
                                     remote_dt = parsedate_to_datetime(last_mod)
-                                    local_dt = datetime.utcfromtimestamp(
-                                        file_path.stat().st_mtime
+                                    local_dt = datetime.fromtimestamp(
+                                        file_path.stat().st_mtime, timezone.utc
                                     )
                                     if remote_dt.tzinfo is None:
-                                        remote_dt = remote_dt.replace(tzinfo=None)
-                                    # Compare in UTC naive format
+                                        remote_dt = remote_dt.replace(
+                                            tzinfo=timezone.utc
+                                        )
+                                    # Compare as timezone-aware UTC datetimes
                                     if remote_dt > local_dt:
                                         need_download = True
                                 except Exception as e:
@@ -297,18 +403,13 @@ def download_zip_files_from_url(
                 if need_download:
                     logger.info("Downloading %s to %s...", file_url, file_path)
                     try:
-                        # Specify a user agent for the download request
-                        headers = {
-                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
-                        }
                         # Stream file content to the local file
-                        file_response = requests.get(
-                            file_url, headers=headers, stream=True, timeout=60
-                        )
+                        file_response = session.get(file_url, stream=True, timeout=60)
                         file_response.raise_for_status()
                         with open(file_path, "wb") as f:
                             for chunk in file_response.iter_content(chunk_size=8192):
                                 f.write(chunk)
+                        _write_download_metadata(file_path, file_response.headers)
 
                         logger.info("Successfully downloaded %s", file_name)
 
@@ -339,6 +440,7 @@ def download_hmda_files(
     destination_folder: str = "./data/raw",
     include_mlar: bool = False,
     include_historical: bool = False,
+    max_workers: int = 1,
     **kwargs
 ) -> None:
     """
@@ -358,8 +460,15 @@ def download_hmda_files(
         Whether to download Modified LAR files. Default is False.
     include_historical : bool, optional
         Whether to download historical files (2007-2017). Default is False.
+    max_workers : int, optional
+        Number of pages downloaded concurrently, each in its own headless
+        Chrome session. Each worker still pauses ``pause_length`` seconds
+        between its own files. Default is 1 (sequential downloads).
     **kwargs
-        Additional arguments passed to download_zip_files_from_url
+        Additional arguments passed to download_zip_files_from_url. A
+        ``session`` passed here is shared by every page, so only supply one
+        when ``max_workers`` is 1; otherwise each worker thread creates its
+        own session.
 
     Examples
     --------
@@ -376,21 +485,41 @@ def download_hmda_files(
     mlar_base_url = "https://ffiec.cfpb.gov/data-publication/modified-lar"
     historical_url = "https://www.consumerfinance.gov/data-research/hmda/historic-data/?geo=nationwide&records=all-records&field_descriptions=codes"
 
-    # Download standard files for each year
+    # Install ChromeDriver once up front so concurrent workers do not race on
+    # the webdriver-manager cache
+    if "driver_path" not in kwargs:
+        kwargs["driver_path"] = ChromeDriverManager().install()
+
+    # requests.Session is not thread-safe, so each worker thread keeps its own
+    # keep-alive session (reused across its pages) unless the caller supplied one
+    thread_state = threading.local()
+
+    def download_page(target_url: str, options: dict) -> None:
+        page_kwargs = dict(kwargs)
+        if "session" not in page_kwargs:
+            if not hasattr(thread_state, "session"):
+                thread_state.session = create_download_session()
+            page_kwargs["session"] = thread_state.session
+        download_zip_files_from_url(
+            target_url, destination_folder, **options, **page_kwargs
+        )
+
+    # Collect every (page, options) pair: standard files for each year, plus
+    # MLAR and historical pages if requested
+    tasks = []
     for year in years:
         for base_url in [snapshot_base_url, one_year_base_url, three_year_base_url]:
-            target_url = f"{base_url}/{year}"
-            download_zip_files_from_url(target_url, destination_folder, **kwargs)
-
-        # Download MLAR files if requested
+            tasks.append((f"{base_url}/{year}", {}))
         if include_mlar:
-            target_url = f"{mlar_base_url}/{year}"
-            download_zip_files_from_url(
-                target_url, destination_folder, download_all=True, **kwargs
-            )
-
-    # Download historical files if requested
+            tasks.append((f"{mlar_base_url}/{year}", {"download_all": True}))
     if include_historical:
-        download_zip_files_from_url(
-            historical_url, destination_folder, download_all=True, **kwargs
-        )
+        tasks.append((historical_url, {"download_all": True}))
+
+    # Pages are I/O-bound, so overlap them with a small bounded thread pool
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(download_page, target_url, options)
+            for target_url, options in tasks
+        ]
+        for future in futures:
+            future.result()
@@ -63,41 +63,23 @@ def _destring_and_cast_hmda_cols_2007_2017(lf: pl.LazyFrame) -> pl.LazyFrame:
     """
     logger.info("Destringing HMDA variables and casting to consistent types (2007-2017)")
 
-    # Cast float columns to Float64
-    float_cols_to_cast = [col for col in lf.collect_schema().names() if col in PERIOD_2007_2017_FLOAT_COLUMNS]
-    if float_cols_to_cast:
-        lf = lf.with_columns([
-            pl.col(col).cast(pl.Float64, strict=False).alias(col)
-            for col in float_cols_to_cast
-        ])
-
-    # Cast integer columns to Int64
-    int_cols_to_cast = [
-        col for col in lf.collect_schema().names()
-        if col in PERIOD_2007_2017_INTEGER_COLUMNS
-    ]
-    if int_cols_to_cast:
-        lf = lf.with_columns([
-            pl.col(col).cast(pl.Int64, strict=False).alias(col)
-            for col in int_cols_to_cast
-        ])
-
-    # Special handling: loan_amount stored in thousands, multiply by 1000
-    if "loan_amount" in lf.collect_schema().names():
-        lf = lf.with_columns(
-            pl.col("loan_amount")
-            .mul(1000)
-            .alias("loan_amount")
-        )
+    lf_columns = lf.collect_schema().names()
 
-    # Special handling: income stored in thousands, multiply by 1000
-    if "income" in lf.collect_schema().names():
+    # Cast float columns to Float64 and integer columns to Int64 together
+    float_cols_to_cast = [col for col in lf_columns if col in PERIOD_2007_2017_FLOAT_COLUMNS]
+    int_cols_to_cast = [col for col in lf_columns if col in PERIOD_2007_2017_INTEGER_COLUMNS]
+    if float_cols_to_cast or int_cols_to_cast:
         lf = lf.with_columns(
-            pl.col("income")
-            .mul(1000)
-            .alias("income")
+            [pl.col(col).cast(pl.Float64, strict=False) for col in float_cols_to_cast]
+            + [pl.col(col).cast(pl.Int64, strict=False) for col in int_cols_to_cast]
         )
 
+    # Special handling: loan_amount and income are stored in thousands,
+    # multiply by 1000
+    thousands_cols = [col for col in ["loan_amount", "income"] if col in lf_columns]
+    if thousands_cols:
+        lf = lf.with_columns(pl.col(thousands_cols).mul(1000))
+
     return lf
 
 
@@ -158,16 +140,18 @@ def _standardize_geographic_codes_period_2007_2017(lf: pl.LazyFrame) -> pl.LazyF
     if "census_tract" in lf.collect_schema().names():
         lf = lf.with_columns(
             (
-                pl.col("state_code") +
-                pl.col("county_code").str.slice(-3, 3) +
-                pl.col("census_tract")
+                # county_code is the 5-digit state+county FIPS, so the tract is
+                # county * 10^6 + tract * 100, padded once to 11 digits
+                pl.col("county_code").cast(pl.Int64, strict=False).mul(1_000_000)
+                + pl.col("census_tract")
                 .cast(pl.Float64, strict=False)
                 .mul(100)
                 .round(0)
                 .cast(pl.Int64, strict=False)
-                .cast(pl.String)
-                .str.zfill(6)
-            ).alias("census_tract")
+            )
+            .cast(pl.String)
+            .str.zfill(11)
+            .alias("census_tract")
         )
 
     # Step 4: Standardize msa_md to 5-digit string with leading zeros
@@ -224,8 +208,11 @@ def build_bronze_period_2007_2017(
     bronze_folder = get_medallion_dir("bronze", dataset, "period_2007_2017")
     bronze_folder.mkdir(parents=True, exist_ok=True)
 
+    # List the raw folder once and select each year's archives from it
+    all_archives = sorted(raw_folder.glob("*.zip"))
+
     for year in range(min_year, max_year + 1):
-        archives = sorted(raw_folder.glob(f"*{year}*.zip"))
+        archives = [archive for archive in all_archives if str(year) in archive.name]
         if not archives:
             logger.debug("No raw archives found for %s %s", dataset, year)
             continue
@@ -294,8 +281,11 @@ def build_silver_period_2007_2017(
         shutil.rmtree(silver_folder)
         silver_folder.mkdir(parents=True, exist_ok=True)
 
+    # List the bronze folder once and select each year's files from it
+    bronze_files = sorted(bronze_folder.glob("*.parquet"))
+
     for year in range(min_year, max_year + 1):
-        for file in sorted(bronze_folder.glob(f"*{year}*.parquet")):
+        for file in [file for file in bronze_files if str(year) in file.name]:
             lf = pl.scan_parquet(file, low_memory=True)
 
             # Apply column renames (only renames columns that exist)
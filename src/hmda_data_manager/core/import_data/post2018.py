@@ -19,11 +19,14 @@ import logging
 import shutil
 import time
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal
 import polars as pl
+import pyarrow.parquet as pq
 from ...utils.io import (
     get_delimiter,
+    iter_zip_delimited_batches,
     unzip_hmda_file,
     normalized_file_stem,
     should_process_output,
@@ -43,6 +46,51 @@ from ..config import (
 
 logger = logging.getLogger(__name__)
 
+# Silver files are sorted on these columns (when present) before writing
+SILVER_SORT_COLUMNS = ["activity_year", "action_taken", "lei"]
+
+# Rows per silver row group; small enough for statistics-based pruning to
+# skip most of a file on selective filters
+SILVER_ROW_GROUP_SIZE = 100_000
+
+# Exempt values appear as "Exempt"; rate, ratio, and term fields may also carry
+# the numeric exempt code "1111". Dollar amounts and counts (income, loan
+# costs, affordable units, ...) keep "1111" as a literal value.
+_EXEMPT_CODE_COLUMNS = [
+    "combined_loan_to_value_ratio",
+    "interest_rate",
+    "rate_spread",
+    "loan_term",
+    "prepayment_penalty_term",
+    "intro_rate_period",
+]
+
+# Bucketed string codes recoded to numbers during harmonization
+_TOTAL_UNITS_CODES = {"5-24": 5, "25-49": 6, "50-99": 7, "100-149": 8, ">149": 9}
+_AGE_CODES = {
+    "<25": 1, "25-34": 2, "35-44": 3, "45-54": 4, "55-64": 5, "65-74": 6, ">74": 7,
+}
+_YES_NO_CODES = {
+    "No": 0, "no": 0, "NO": 0, "Yes": 1, "yes": 1, "YES": 1,
+    "Na": None, "na": None, "NA": None,
+}
+_DTI_CODES = {
+    "<20%": 10, "20%-<30%": 20, "30%-<36%": 30, "50%-60%": 50, ">60%": 60,
+    "Exempt": -99999, "1111": -99999,
+}
+_CONFORMING_LOAN_LIMIT_CODES = {"NC": 0, "C": 1, "U": -99999, "NA": -99999}
+
+# Column -> (code mapping, target dtype)
+_CATEGORY_RECODES = {
+    "total_units": (_TOTAL_UNITS_CODES, pl.Int16),
+    "applicant_age": (_AGE_CODES, pl.Int16),
+    "co_applicant_age": (_AGE_CODES, pl.Int16),
+    "applicant_age_above_62": (_YES_NO_CODES, pl.Int16),
+    "co_applicant_age_above_62": (_YES_NO_CODES, pl.Int16),
+    "debt_to_income_ratio": (_DTI_CODES, pl.Int64),
+    "conforming_loan_limit": (_CONFORMING_LOAN_LIMIT_CODES, pl.Int64),
+}
+
 
 def _get_file_type_code(file_name: Path | str) -> str:
     """Derive the HMDA file type code from a file name.
@@ -90,7 +138,8 @@ def _harmonize_schema(lf: pl.LazyFrame) -> pl.LazyFrame:
     - Destringing numeric variables
     - Casting integer-like floats to integers
     - Standardizing census tract format
-    - Handling exempt/special values
+    - Handling exempt/special values ("Exempt", and the "1111" exempt code in
+      rate, ratio, and term fields, become -99999)
 
     Parameters
     ----------
@@ -104,95 +153,50 @@ def _harmonize_schema(lf: pl.LazyFrame) -> pl.LazyFrame:
     pl.LazyFrame
         LazyFrame with harmonized schema including properly typed numeric fields
         and formatted census tract column.
+
+    Examples
+    --------
+    "1111" is an exempt code in rate fields but a real amount in income:
+
+    >>> lf = pl.LazyFrame({"income": ["1111"], "interest_rate": ["1111"]})
+    >>> _harmonize_schema(lf).collect().row(0)
+    (1111000, -99999.0)
     """
 
     # Get existing columns once at the start
     lf_columns = lf.collect_schema().names()
 
-    # Replace exempt columns with -99999 (only if they exist)
-    for exempt_col in POST2018_EXEMPT_COLUMNS:
-        if exempt_col in lf_columns:
-            lf = lf.with_columns(
-                pl.col(exempt_col)
-                .replace("Exempt", "-99999")
-                .alias(exempt_col)
-            )
-
-    # Clean Units (only if column exists)
-    if "total_units" in lf_columns:
+    # Replace exempt values with -99999 (only if the columns exist); "1111" is
+    # only an exempt code in the coded fields, elsewhere it is a real amount
+    exempt_cols = [col for col in POST2018_EXEMPT_COLUMNS if col in lf_columns]
+    if exempt_cols:
         lf = lf.with_columns(
-            pl.col("total_units")
-            .replace(
-                ["5-24", "25-49", "50-99", "100-149", ">149"],
-                [5, 6, 7, 8, 9],
+            pl.col(col).replace(
+                ["Exempt", "1111"] if col in _EXEMPT_CODE_COLUMNS else ["Exempt"],
+                "-99999",
             )
-            .cast(pl.Int16, strict=False)
-            .alias("total_units")
+            for col in exempt_cols
         )
 
-    # Clean Age (only if columns exist)
-    for replace_column in ["applicant_age", "co_applicant_age"]:
-        if replace_column in lf_columns:
-            lf = lf.with_columns(
-                pl.col(replace_column)
-                .replace(
-                    ["<25", "25-34", "35-44", "45-54", "55-64", "65-74", ">74"],
-                    [1, 2, 3, 4, 5, 6, 7],
-                )
-                .cast(pl.Int16, strict=False)
-                .alias(replace_column)
-            )
-
-    # Clean Age Dummy Variables (only if columns exist)
-    for replace_column in ["applicant_age_above_62", "co_applicant_age_above_62"]:
-        if replace_column in lf_columns:
-            lf = lf.with_columns(
-                pl.col(replace_column)
-                .replace(
-                    ["No", "no", "NO", "Yes", "yes", "YES", "Na", "na", "NA"],
-                    [0, 0, 0, 1, 1, 1, None, None, None],
-                )
-                .cast(pl.Int16, strict=False)
-                .alias(replace_column)
-            )
-
-    # Clean Debt-to-Income (only if column exists)
-    if "debt_to_income_ratio" in lf_columns:
+    # Recode bucketed categories (units, age, DTI, conforming limit) with one
+    # lookup per column, all in a single projection
+    recodes = [
+        pl.col(column).replace(codes).cast(dtype, strict=False)
+        for column, (codes, dtype) in _CATEGORY_RECODES.items()
+        if column in lf_columns
+    ]
+    if recodes:
+        lf = lf.with_columns(recodes)
+
+    # Cast safe strings to floats and integers in a single projection
+    float_cols = [col for col in POST2018_FLOAT_COLUMNS if col in lf_columns]
+    int_cols = [col for col in POST2018_INTEGER_COLUMNS if col in lf_columns]
+    if float_cols or int_cols:
         lf = lf.with_columns(
-            pl.col("debt_to_income_ratio")
-            .replace(
-                ["<20%", "20%-<30%", "30%-<36%", "50%-60%", ">60%", "Exempt"],
-                [10, 20, 30, 50, 60, -99999],
-            )
-            .cast(pl.Int64, strict=False)
-            .alias("debt_to_income_ratio")
+            [pl.col(col).cast(pl.Float64, strict=False) for col in float_cols]
+            + [pl.col(col).cast(pl.Int64, strict=False) for col in int_cols]
         )
 
-    # Clean Conforming Loan Limit (only if column exists)
-    if "conforming_loan_limit" in lf_columns:
-        lf = lf.with_columns(
-            pl.col("conforming_loan_limit")
-            .replace(["NC", "C", "U", "NA"], [0, 1, -99999, -99999])
-            .cast(pl.Int64, strict=False)
-            .alias("conforming_loan_limit")
-        )
-
-    # Cast safe strings to floats
-    for column in POST2018_FLOAT_COLUMNS:
-        if column in lf_columns:
-            lf = lf.with_columns(
-                pl.col(column)
-                .cast(pl.Float64, strict=False)
-                .alias(column)
-            )
-    for column in POST2018_INTEGER_COLUMNS:
-        if column in lf_columns:
-            lf = lf.with_columns(
-                pl.col(column)
-                .cast(pl.Int64, strict=False)
-                .alias(column)
-            )
-
     # Clean income columns (only if column exists)
     if "income" in lf_columns:
         lf = lf.with_columns(
@@ -254,15 +258,116 @@ def _append_hmda_index(
         Lazy frame with formatted HMDAIndex column
     """
     prefix = f"{year}{file_type_code}_"
-    return (
-        lf.cast({HMDA_INDEX_COLUMN: pl.String}, strict=False)
-        .with_columns(pl.col(HMDA_INDEX_COLUMN).str.zfill(9).alias(HMDA_INDEX_COLUMN))
-        .with_columns(
-            (pl.lit(prefix) + pl.col(HMDA_INDEX_COLUMN)).alias(HMDA_INDEX_COLUMN)
-        )
+    # One expression: cast the row number, pad it, and prepend the prefix
+    return lf.with_columns(
+        (
+            pl.lit(prefix)
+            + pl.col(HMDA_INDEX_COLUMN).cast(pl.String, strict=False).str.zfill(9)
+        ).alias(HMDA_INDEX_COLUMN)
     )
 
 
+def _finalize_bronze_frame(
+    lf: pl.LazyFrame, year: int, file_type_code: str, add_hmda_index: bool
+) -> pl.LazyFrame:
+    """Add file_type (and HMDAIndex) and drop derived/tract columns for bronze.
+
+    No renames or destringing happen here; bronze keeps raw string values.
+    """
+    lf = lf.with_columns(pl.lit(file_type_code).alias("file_type"))
+    if add_hmda_index:
+        lf = _append_hmda_index(lf, year, file_type_code)
+    lf = lf.drop(DERIVED_COLUMNS, strict=False)
+    return lf.drop(POST2018_TRACT_COLUMNS, strict=False)
+
+
+def _stream_archive_to_bronze(
+    archive: Path, save_file: Path, year: int, add_hmda_index: bool
+) -> None:
+    """Write a bronze parquet file straight from a ZIP archive.
+
+    Record batches are decompressed and parsed from the archive member, given
+    the bronze columns, and appended to the parquet file as row groups, so the
+    raw delimited file never touches disk.
+    """
+    file_type_code = _get_file_type_code(archive)
+    writer = None
+    rows_seen = 0
+    try:
+        for batch in iter_zip_delimited_batches(archive):
+            df = pl.from_arrow(batch)
+            if add_hmda_index:
+                # Continue the row index across batches so HMDAIndex stays unique
+                df = df.with_row_index(HMDA_INDEX_COLUMN, offset=rows_seen)
+            rows_seen += batch.num_rows
+
+            table = (
+                _finalize_bronze_frame(df.lazy(), year, file_type_code, add_hmda_index)
+                .collect()
+                .to_arrow()
+            )
+            if writer is None:
+                # Page indexes let readers skip individual ~1 MB pages on
+                # filters, not just whole row groups
+                writer = pq.ParquetWriter(
+                    save_file,
+                    table.schema,
+                    compression="zstd",
+                    write_page_index=True,
+                    data_page_size=1 << 20,
+                )
+            writer.write_table(table)
+    except BaseException:
+        # Never leave a partial bronze file that later runs would skip
+        if writer is not None:
+            writer.close()
+            writer = None
+        save_file.unlink(missing_ok=True)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if rows_seen == 0:
+        logger.warning("No rows found in archive: %s", archive)
+
+
+def _extract_archive_to_bronze(
+    archive: Path, save_file: Path, year: int, add_hmda_index: bool
+) -> None:
+    """Write a bronze parquet file by extracting the archive to disk first.
+
+    Used when ``zipfile`` cannot stream the archive member; extraction falls
+    back to 7-Zip in that case.
+    """
+    raw_file_path = Path(unzip_hmda_file(archive, archive.parent))
+    try:
+        # Detect delimiter
+        delimiter = get_delimiter(raw_file_path, bytes=16000)
+
+        # Build lazyframe; add row index only when creating HMDAIndex
+        # Load all columns as strings (bronze = raw data preservation)
+        index_name = HMDA_INDEX_COLUMN if add_hmda_index else None
+        lf = pl.scan_csv(
+            raw_file_path,
+            separator=delimiter,
+            low_memory=True,
+            row_index_name=index_name,
+            infer_schema=False,  # Force all columns to String type
+        )
+
+        file_type_code = _get_file_type_code(archive)
+        lf = _finalize_bronze_frame(lf, year, file_type_code, add_hmda_index)
+
+        # Write bronze file
+        lf.sink_parquet(save_file)
+
+    finally:
+        # Always remove extracted raw CSV to keep raw folder clean
+        time.sleep(1)
+        raw_file_path.unlink(missing_ok=True)
+
+
 def build_bronze_post2018(
     dataset: Literal["loans", "panel", "transmissal_series"],
     min_year: int = 2018,
@@ -271,10 +376,11 @@ def build_bronze_post2018(
 ) -> None:
     """Create bronze layer parquet files for post-2018 data.
 
-    Reads raw ZIPs from data/raw/<dataset>, extracts, detects delimiter,
-    loads all columns as strings (bronze = minimal processing), adds file_type
-    and (for loans) HMDAIndex, drops derived/tract columns, and writes one
-    parquet per archive to data/bronze/<dataset>/post2018.
+    Reads raw ZIPs from data/raw/<dataset>, streams the delimited file out of
+    each archive (detecting the delimiter), loads all columns as strings
+    (bronze = minimal processing), adds file_type and (for loans) HMDAIndex,
+    drops derived/tract columns, and writes one parquet per archive to
+    data/bronze/<dataset>/post2018.
 
     All columns are stored as strings in bronze to preserve raw values and
     enable inspection/validation before silver layer type conversions.
@@ -302,41 +408,60 @@ def build_bronze_post2018(
 
             logger.info("[bronze] Processing archive: %s", archive)
 
-            # Extract and process the archive
-            raw_file_path = Path(unzip_hmda_file(archive, archive.parent))
+            # Stream the archive into parquet; extract to disk only if the
+            # member's compression method cannot be streamed by zipfile
             try:
-                # Detect delimiter
-                delimiter = get_delimiter(raw_file_path, bytes=16000)
-
-                # Build lazyframe; add row index only when creating HMDAIndex
-                # Load all columns as strings (bronze = raw data preservation)
-                index_name = HMDA_INDEX_COLUMN if add_hmda_index else None
-                lf = pl.scan_csv(
-                    raw_file_path,
-                    separator=delimiter,
-                    low_memory=True,
-                    row_index_name=index_name,
-                    infer_schema=False,  # Force all columns to String type
+                _stream_archive_to_bronze(archive, save_file, year, add_hmda_index)
+            except NotImplementedError as e:
+                logger.warning(
+                    "Could not stream %s (%s). Extracting to disk instead.", archive, e
                 )
+                _extract_archive_to_bronze(archive, save_file, year, add_hmda_index)
+            logger.debug("Saved bronze file: %s", save_file)
 
-                # Add file_type and HMDAIndex if requested
-                file_type_code = _get_file_type_code(archive)
-                lf = lf.with_columns(pl.lit(file_type_code).alias("file_type"))
-                if add_hmda_index:
-                    lf = _append_hmda_index(lf, year, file_type_code)
 
-                # Drop derived and tract columns only (no renames or destring here)
-                lf = lf.drop(DERIVED_COLUMNS, strict=False)
-                lf = lf.drop(POST2018_TRACT_COLUMNS, strict=False)
+def _write_silver_file(file: Path, silver_folder: Path, sort_rows: bool = False) -> None:
+    """Clean one bronze parquet file and write it into the silver partitions.
 
-                # Write bronze file
-                lf.sink_parquet(save_file)
-                logger.debug("Saved bronze file: %s", save_file)
-
-            finally:
-                # Always remove extracted raw CSV to keep raw folder clean
-                time.sleep(1)
-                raw_file_path.unlink(missing_ok=True)
+    When ``sort_rows`` is True the file is sorted on ``SILVER_SORT_COLUMNS``
+    before writing; the sort is blocking, so the whole file is held in memory.
+    """
+    lf = pl.scan_parquet(file, low_memory=True)
+
+    # Apply column renames (only renames columns that exist)
+    existing_cols = lf.collect_schema().names()
+    renames_to_apply = {
+        old: new for old, new in RENAME_DICTIONARY.items() if old in existing_cols
+    }
+    if renames_to_apply:
+        logger.debug(
+            "Renaming %d columns: %s", len(renames_to_apply), renames_to_apply
+        )
+        lf = lf.rename(renames_to_apply)
+
+    # Apply schema harmonization (type conversions) to all datasets
+    lf = _harmonize_schema(lf)
+
+    # Optionally cluster rows on common filter columns so row-group min/max
+    # statistics are selective (e.g. action_taken == 1 skips most row groups);
+    # files left in HMDAIndex order span every code in every row group
+    if sort_rows:
+        sort_columns = [
+            col for col in SILVER_SORT_COLUMNS if col in lf.collect_schema().names()
+        ]
+        if sort_columns:
+            lf = lf.sort(sort_columns)
+
+    # Write using hive partitioning
+    lf.sink_parquet(
+        pl.PartitionByKey(
+            silver_folder,
+            by=[pl.col("activity_year"), pl.col("file_type")],
+            include_key=True,
+        ),
+        row_group_size=SILVER_ROW_GROUP_SIZE,
+        mkdir=True,
+    )
 
 
 def build_silver_post2018(
@@ -344,12 +469,27 @@ def build_silver_post2018(
     min_year: int = 2018,
     max_year: int = 2024,
     replace: bool = False,
+    max_workers: int = 1,
+    sort_rows: bool = False,
 ) -> None:
     """Create hive-partitioned silver layer for post-2018 data.
 
-    Processes bronze parquet files one-at-a-time, applies standard cleaning
-    transforms with schema-guided typing, and writes to
+    Processes bronze parquet files, applies standard cleaning transforms with
+    schema-guided typing, and writes to
     data/silver/<dataset>/post2018/activity_year=YYYY/file_type=X/.
+
+    Rows are written in row groups of ``SILVER_ROW_GROUP_SIZE``. By default
+    each file streams through in bronze (HMDAIndex) order with bounded memory.
+    With ``sort_rows=True`` rows are first sorted on ``SILVER_SORT_COLUMNS``
+    so filtered scans can prune row groups on statistics; the sort cannot
+    stream, so a whole bronze file (tens of millions of rows for a national
+    LAR) is held in memory, and silver files are no longer in HMDAIndex order.
+
+    Each bronze file fills its own (activity_year, file_type) partition, so
+    files can be written concurrently by setting ``max_workers`` above 1.
+    The default of 1 processes files one at a time; Polars already spreads
+    each file's sink across all cores. With ``sort_rows=True`` every worker
+    holds its own file in memory, so raise ``max_workers`` with care.
     """
     bronze_folder = get_medallion_dir("bronze", dataset, "post2018")
     silver_folder = get_medallion_dir("silver", dataset, "post2018")
@@ -360,30 +500,17 @@ def build_silver_post2018(
         shutil.rmtree(silver_folder)
         silver_folder.mkdir(parents=True, exist_ok=True)
 
-    for year in range(min_year, max_year + 1):
-        for file in bronze_folder.glob(f"*{year}*.parquet"):
-            lf = pl.scan_parquet(file, low_memory=True)
-
-            # Apply column renames (only renames columns that exist)
-            existing_cols = lf.collect_schema().names()
-            renames_to_apply = {
-                old: new for old, new in RENAME_DICTIONARY.items() if old in existing_cols
-            }
-            if renames_to_apply:
-                logger.debug(
-                    "Renaming %d columns: %s", len(renames_to_apply), renames_to_apply
-                )
-                lf = lf.rename(renames_to_apply)
-
-            # Apply schema harmonization (type conversions) to all datasets
-            lf = _harmonize_schema(lf)
-
-            # Write using hive partitioning
-            lf.sink_parquet(
-                pl.PartitionByKey(
-                    silver_folder,
-                    by=[pl.col("activity_year"), pl.col("file_type")],
-                    include_key=True,
-                ),
-                mkdir=True,
-            )
+    files = [
+        file
+        for year in range(min_year, max_year + 1)
+        for file in bronze_folder.glob(f"*{year}*.parquet")
+    ]
+
+    # Polars releases the GIL while sinking, so threads overlap the writes
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_write_silver_file, file, silver_folder, sort_rows)
+            for file in files
+        ]
+        for future in futures:
+            future.result()
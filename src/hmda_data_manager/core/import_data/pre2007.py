@@ -123,21 +123,26 @@ def build_bronze_pre2007(
             delimiter = get_delimiter(temp_path, bytes=16000)
             logger.info("Detected delimiter: %r", delimiter)
 
-            # Load data with ALL COLUMNS AS STRINGS
-            logger.info("Loading data (all columns as strings)...")
-            df = pl.read_csv(
+            # Stream the file to parquet with ALL COLUMNS AS STRINGS; the
+            # streaming engine keeps memory bounded by batch, not file size
+            logger.info("Streaming data to parquet (all columns as strings)...")
+            lf = pl.scan_csv(
                 temp_path,
                 separator=delimiter,
                 ignore_errors=True,
                 infer_schema=False,  # Force all columns to String type
                 encoding="utf8-lossy",  # Handle invalid UTF-8 sequences
+                low_memory=True,
+            )
+            lf.sink_parquet(save_file)
+
+            # Row count comes from the parquet footer, not a re-read
+            logger.info(
+                "Saved bronze file: %s (%d rows, %d columns)",
+                save_file,
+                pl.scan_parquet(save_file).select(pl.len()).collect().item(),
+                len(lf.collect_schema()),
             )
-
-            logger.info("Loaded %d rows, %d columns", len(df), len(df.columns))
-
-            # Save to parquet
-            df.write_parquet(save_file)
-            logger.info("Saved bronze file: %s", save_file)
 
         finally:
             # Clean up extracted file
@@ -207,17 +212,18 @@ def _standardize_geographic_codes(lf: pl.LazyFrame) -> pl.LazyFrame:
     if "census_tract" in lf.collect_schema().names():
         lf = lf.with_columns(
             (
-                # Take state_code (2-digit) + county last 3 digits + tract (6-digit)
-                pl.col("state_code") +
-                pl.col("county_code").str.slice(-3, 3) +
-                pl.col("census_tract")
+                # county_code is the 5-digit state+county FIPS, so the tract is
+                # county * 10^6 + tract * 100, padded once to 11 digits
+                pl.col("county_code").cast(pl.Int64, strict=False).mul(1_000_000)
+                + pl.col("census_tract")
                 .cast(pl.Float64, strict=False)
                 .mul(100)
                 .round(0)
                 .cast(pl.Int64, strict=False)
-                .cast(pl.String)
-                .str.zfill(6)
-            ).alias("census_tract")
+            )
+            .cast(pl.String)
+            .str.zfill(11)
+            .alias("census_tract")
         )
 
     # Step 4: Standardize msa_md to 5-digit string with leading zeros
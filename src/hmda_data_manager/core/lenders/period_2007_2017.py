@@ -88,13 +88,22 @@ def combine_lenders_panel_ts_period_2007_2017(
     save_folder: Path,
     min_year: int = 2007,
     max_year: int = 2017,
+    csv: bool = True,
+    parquet_compression: str = "zstd",
+    parquet_compression_level: int | None = None,
 ) -> None:
-    """Combine Panel and TS CSV files for the 2007-2017 period and write CSV.
+    """Combine Panel and TS CSV files for the 2007-2017 period and save outputs.
 
     - Loads CSVs for panel and TS per year
     - Harmonizes column names for panel files
     - Merges on ["Activity Year", "Respondent ID", "Agency Code"]
-    - Writes pipe-delimited CSV to save_folder
+    - Writes pipe-delimited CSV (if ``csv`` is True) and Parquet to save_folder;
+      object columns are stored as strings in the Parquet file
+
+    Parquet output defaults to Zstd at the codec's default level, which decodes
+    faster than Gzip at a similar ratio; pass ``parquet_compression="snappy"``
+    for older readers. ``parquet_compression_level`` is only forwarded when
+    set, since not every codec accepts one.
     """
     panel_folder = Path(panel_folder)
     ts_folder = Path(ts_folder)
@@ -111,9 +120,33 @@ def combine_lenders_panel_ts_period_2007_2017(
     logger.info("Merging panel and TS data (2007-2017)")
     df = _merge_panel_ts_2007_2017(df_panel, df_ts)
 
-    csv_path = save_folder / f"hmda_lenders_combined_{min_year}-{max_year}.csv"
-    logger.info("Saving combined data to %s", csv_path)
-    df.to_csv(csv_path, index=False, sep="|")
+    file_stem = f"hmda_lenders_combined_{min_year}-{max_year}"
+    parquet_path = save_folder / f"{file_stem}.parquet"
+
+    if csv:
+        csv_path = save_folder / f"{file_stem}.csv"
+        logger.info("Saving combined data to %s", csv_path)
+        df.to_csv(csv_path, index=False, sep="|")
+
+    # Per-year CSVs read with low_memory=False leave object columns that mix
+    # ints and strings across years (e.g. Respondent ID "13-1234567"), which
+    # Arrow cannot type; store those columns as strings in the Parquet file
+    object_columns = df.select_dtypes(include="object").columns
+    df_parquet = df.astype({column: "string" for column in object_columns})
+
+    logger.info("Saving combined data to %s", parquet_path)
+    # Codecs like snappy reject a compression level, so only pass one if given
+    level_kwargs = (
+        {}
+        if parquet_compression_level is None
+        else {"compression_level": parquet_compression_level}
+    )
+    df_parquet.to_parquet(
+        parquet_path,
+        index=False,
+        compression=parquet_compression,
+        **level_kwargs,
+    )
 
 
 __all__ = [
@@ -55,12 +55,18 @@ def combine_lenders_panel_ts_post2018(
     save_folder: Path,
     min_year: int = 2018,
     max_year: int = 2023,
+    csv: bool = True,
+    parquet_compression: str = "zstd",
+    parquet_compression_level: int | None = None,
 ) -> None:
     """Combine Panel and TS parquet files for post-2018 lenders and save outputs.
 
     - Loads per-year parquet files for panel and TS
     - Merges on ['activity_year', 'lei']
-    - Writes CSV (pipe-delimited) and Parquet to save_folder
+    - Writes Parquet (and, if ``csv`` is True, pipe-delimited CSV) to save_folder
+    - Compresses Parquet with ``parquet_compression`` (Zstd by default);
+      ``parquet_compression_level`` is only forwarded when set, since codecs
+      such as snappy do not accept one
     """
     panel_folder = Path(panel_folder)
     ts_folder = Path(ts_folder)
@@ -81,9 +87,22 @@ def combine_lenders_panel_ts_post2018(
     csv_path = save_folder / f"{file_stem}.csv"
     parquet_path = save_folder / f"{file_stem}.parquet"
 
-    logger.info("Saving combined data to %s", csv_path)
-    df.to_csv(csv_path, index=False, sep="|")
-    df.to_parquet(parquet_path, index=False)
+    logger.info("Saving combined data to %s", parquet_path)
+    # Codecs like snappy reject a compression level, so only pass one if given
+    level_kwargs = (
+        {}
+        if parquet_compression_level is None
+        else {"compression_level": parquet_compression_level}
+    )
+    df.to_parquet(
+        parquet_path,
+        index=False,
+        compression=parquet_compression,
+        **level_kwargs,
+    )
+    if csv:
+        logger.info("Saving combined data to %s", csv_path)
+        df.to_csv(csv_path, index=False, sep="|")
 
     logger.info("Successfully created combined lender file with %s records", len(df))
 
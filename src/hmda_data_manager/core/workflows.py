@@ -76,6 +76,7 @@ def download_workflow(
         Whether to download historical 2007-2017 files
     **kwargs : Any
         Additional keyword arguments to pass to download_hmda_files:
+        - max_workers: Number of pages downloaded concurrently (default: 1)
         - pause_length: Seconds between downloads (default: 5)
         - wait_time: Seconds to wait for JavaScript to load (default: 10)
         - overwrite_mode: "skip", "always", "if_newer", "if_size_diff" (default: "skip")
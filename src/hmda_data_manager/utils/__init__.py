@@ -23,6 +23,7 @@ from .io import (
     get_delimiter,
     unzip_hmda_file,
     replace_csv_column_names,
+    iter_zip_delimited_batches,
 )
 from .cleaning import (
     clean_hmda,
@@ -52,6 +53,7 @@ __all__ = [
     "get_delimiter",
     "unzip_hmda_file",
     "replace_csv_column_names",
+    "iter_zip_delimited_batches",
 
     # Data transformation
     "rename_hmda_columns",
@@ -6,6 +6,7 @@ Helpers to export HMDA datasets to Stata with variable and value labels.
 """
 
 import ast
+import functools
 import logging
 from pathlib import Path
 
@@ -15,6 +16,21 @@ import pandas as pd
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_label_file(label_file: str, mtime_ns: int) -> dict:
+    """Parse a label dictionary file; cached on its path and mtime."""
+    with open(label_file, "r") as f:
+        return ast.literal_eval(f.read())
+
+
+def _load_label_file(label_file: Path) -> dict:
+    """Return the parsed labels in ``label_file``, re-reading only if it changed.
+
+    The returned dict is shared between calls and must not be mutated.
+    """
+    return _parse_label_file(str(label_file), Path(label_file).stat().st_mtime_ns)
+
+
 def prepare_hmda_for_stata(
     df: pd.DataFrame,
     labels_folder: Path | None = None,
@@ -35,10 +51,9 @@ def prepare_hmda_for_stata(
     if variable_label_file is None:
         variable_label_file = labels_folder / "hmda_variable_labels.txt"
 
-    with open(value_label_file, "r") as f:
-        value_labels = ast.literal_eval(f.read())
-    with open(variable_label_file, "r") as f:
-        variable_labels = ast.literal_eval(f.read())
+    # Parsed once per file; exporting several years reuses the same dicts
+    value_labels = _load_label_file(value_label_file)
+    variable_labels = _load_label_file(variable_label_file)
 
     # Trim names/labels to Stata limits and align to existing columns
     variable_labels = {
@@ -54,17 +69,30 @@ def prepare_hmda_for_stata(
     df = df.copy()
     df.columns = [x[0:32].replace("-", "_") for x in df.columns]
 
-    # Downcast common integer-like columns to compact Stata types
-    vl = [key for key, _ in value_labels.items()]
-    for col in vl + ["activity_year"]:
+    # Downcast common integer-like columns to compact Stata types. Integer
+    # columns whose range fits Int16 are cast together in one assignment; the
+    # rest (floats, strings, out-of-range) are tried one at a time
+    candidates = [
+        col for col in dict.fromkeys([*value_labels, "activity_year"]) if col in df.columns
+    ]
+    int_cols = [col for col in candidates if pd.api.types.is_integer_dtype(df[col])]
+    lo = df[int_cols].min().fillna(0)
+    hi = df[int_cols].max().fillna(0)
+    bulk_cols = [col for col in int_cols if lo[col] >= -32768 and hi[col] <= 32767]
+    if bulk_cols:
+        df[bulk_cols] = df[bulk_cols].astype("Int16")
+    for col in candidates:
+        if col in bulk_cols:
+            continue
         try:
-            if col in df.columns:
-                df[col] = df[col].astype("Int16")
+            df[col] = df[col].astype("Int16")
         except (TypeError, OverflowError):
             logger.warning("Cannot downcast variable: %s", col)
-    for col in ["msa_md", "county_code", "sequence_number"]:
-        if col in df.columns:
-            df[col] = df[col].astype("Int32")
+    int32_cols = [
+        col for col in ["msa_md", "county_code", "sequence_number"] if col in df.columns
+    ]
+    if int32_cols:
+        df[int32_cols] = df[int32_cols].astype("Int32")
 
     return df, variable_labels, value_labels
 
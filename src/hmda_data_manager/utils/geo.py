@@ -11,8 +11,17 @@ def split_and_save_tract_variables(df, save_folder, file_name):
     """
     Split and save tract variables from the HMDA data frame.
     Returns the original frame with those variables removed.
+
+    For a polars LazyFrame the tract table is deduplicated and streamed to
+    parquet with ``sink_parquet``, so it is never materialized in memory, and
+    the returned frame stays lazy.
+
+    Tract variables are constant within an (activity_year, census_tract)
+    pair, so rows are deduplicated on those two keys only and the first
+    occurrence is kept. The sidecar is sorted on the same keys so each year's
+    tracts are contiguous and compress well.
     """
-    if not isinstance(df, [pd.DataFrame, pl.DataFrame, pl.LazyFrame]):
+    if not isinstance(df, (pd.DataFrame, pl.DataFrame, pl.LazyFrame)):
         raise ValueError(
             "The input dataframe must be a pandas DataFrame, polars lazyframe, or polars dataframe."
         )
@@ -26,21 +35,34 @@ def split_and_save_tract_variables(df, save_folder, file_name):
         "tract_one_to_four_family_homes",
         "tract_median_age_of_housing_units",
     ]
-    tract_variables = [x for x in tract_variables if x in df.columns]
+    columns = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
+    tract_variables = [x for x in tract_variables if x in columns]
+    tract_keys = ["activity_year", "census_tract"]
+    save_file = f"{save_folder}/tract_variables/tract_vars_{file_name}.parquet"
 
     if isinstance(df, pd.DataFrame):
         for tract_variable in tract_variables:
             df[tract_variable] = pd.to_numeric(df[tract_variable], errors="coerce")
         if tract_variables:
-            df_tract = df[["activity_year", "census_tract"] + tract_variables].drop_duplicates()
-            df_tract.to_parquet(f"{save_folder}/tract_variables/tract_vars_{file_name}.parquet", index=False)
+            df_tract = (
+                df[tract_keys + tract_variables]
+                .drop_duplicates(subset=tract_keys)
+                .sort_values(tract_keys)
+            )
+            df_tract.to_parquet(save_file, index=False)
             df = df.drop(columns=tract_variables)
-    elif isinstance(df, pl.DataFrame) | isinstance(df, pl.LazyFrame):
-        for tract_variable in tract_variables:
-            df = df.with_columns(pl.col(tract_variable).cast(pl.Float64))
+    else:
         if tract_variables:
-            df_tract = df.select(["activity_year", "census_tract"] + tract_variables).drop_duplicates()
-            df_tract.write_parquet(f"{save_folder}/tract_variables/tract_vars_{file_name}.parquet")
+            df = df.with_columns(pl.col(tract_variables).cast(pl.Float64))
+            df_tract = (
+                df.select(tract_keys + tract_variables)
+                .unique(subset=tract_keys, keep="first")
+                .sort(tract_keys)
+            )
+            if isinstance(df_tract, pl.LazyFrame):
+                df_tract.sink_parquet(save_file)
+            else:
+                df_tract.write_parquet(save_file)
             df = df.drop(tract_variables)
     return df
 
@@ -2,16 +2,36 @@
 Input/Output utilities for HMDA data (delimiters, CSV header tweaks, unzip).
 """
 
+import functools
 import io
 import logging
+import os
+import shutil
 import subprocess
+import tempfile
 import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from csv import Sniffer
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.csv as pv
+
 
 logger = logging.getLogger(__name__)
 
+# Copy buffer for archive extraction; far larger than shutil's default so
+# multi-GB members are written with fewer syscalls
+EXTRACT_BUFFER_SIZE = 4 << 20
+
+# Header fixes applied to panel files, whose column names vary across releases
+PANEL_COLUMN_NAME_MAPPER = {
+    "topholder_rssd": "top_holder_rssd",
+    "topholder_name": "top_holder_name",
+    "upper": "lei",
+}
+
 
 def normalized_file_stem(stem: str) -> str:
     """Remove common suffixes from extracted archive names.
@@ -51,46 +71,112 @@ def should_process_output(path: Path, replace: bool) -> bool:
     return replace or not path.exists()
 
 
+def _detect_delimiter(data: str) -> str:
+    """Detect the delimiter of a sample from the start of a delimited file."""
+    # HMDA headers contain exactly one of the candidate delimiters, which
+    # settles it without running the (regex-heavy) Sniffer
+    header = data.split("\n", 1)[0]
+    candidates = [d for d in ("|", ",", "\t") if d in header]
+    if len(candidates) == 1:
+        return candidates[0]
+
+    return Sniffer().sniff(data).delimiter
+
+
+@functools.lru_cache(maxsize=256)
+def _sniff_delimiter(file_path: str, size: int, mtime_ns: int, bytes: int) -> str:
+    """Sniff the delimiter of a file; cached on its path, size and mtime."""
+    with io.open(file_path, mode="r", encoding="latin-1") as f:
+        return _detect_delimiter(f.read(bytes))
+
+
 def get_delimiter(file_path: Path | str, bytes: int = 4096) -> str:
     """Determine the delimiter used in a delimited text file."""
-    sniffer = Sniffer()
-    data = io.open(file_path, mode="r", encoding="latin-1").read(bytes)
-    return sniffer.sniff(data).delimiter
+    stat = os.stat(file_path)
+    return _sniff_delimiter(str(file_path), stat.st_size, stat.st_mtime_ns, bytes)
 
 
 def replace_csv_column_names(
     csv_file: Path | str, column_name_mapper: dict[str, str] | None = None
 ) -> None:
-    """Replace column headers in a CSV file based on a mapping."""
+    """Replace column headers in a CSV file based on a mapping.
+
+    Only the header line is read. A header of the same byte length is
+    overwritten in place; otherwise the body is stream-copied behind the new
+    header into a temporary file that then replaces the original.
+    """
     from .io import get_delimiter  # local import to avoid cycles
 
     if column_name_mapper is None:
         column_name_mapper = {}
 
+    csv_file = Path(csv_file)
     delimiter = get_delimiter(csv_file, bytes=16000)
-    with open(csv_file, "r") as f:
-        first_line = f.readline().strip()
+    with open(csv_file, "rb") as f:
+        header = f.readline()
 
-    first_line_items = first_line.split(delimiter)
-    new_first_line_items = []
-    for first_line_item in first_line_items:
-        for key, item in column_name_mapper.items():
-            if first_line_item == key:
-                first_line_item = item
-        new_first_line_items.append(first_line_item)
-    new_first_line = delimiter.join(new_first_line_items)
+    first_line = header.rstrip(b"\r\n").decode("latin-1")
+    line_ending = header[len(first_line):]
+    new_first_line = delimiter.join(
+        column_name_mapper.get(item, item) for item in first_line.split(delimiter)
+    )
+    new_header = new_first_line.encode("latin-1") + line_ending
 
-    with open(csv_file, "r") as f:
-        lines = f.readlines()
-    lines[0] = new_first_line + "\n"
-    with open(csv_file, "w") as f:
-        f.writelines(lines)
+    if new_header == header:
+        return
+
+    if len(new_header) == len(header):
+        with open(csv_file, "r+b") as f:
+            f.write(new_header)
+        return
+
+    with tempfile.NamedTemporaryFile(dir=csv_file.parent, delete=False) as dst:
+        try:
+            with open(csv_file, "rb") as src:
+                src.readline()
+                dst.write(new_header)
+                shutil.copyfileobj(src, dst, length=1 << 20)
+        except BaseException:
+            dst.close()
+            Path(dst.name).unlink(missing_ok=True)
+            raise
+    # NamedTemporaryFile is created 0600; keep the original file's mode
+    shutil.copymode(csv_file, dst.name)
+    os.replace(dst.name, csv_file)
+
+
+def _extract_zip_member(zip_file: Path, member: str, raw_folder: Path) -> None:
+    """Extract one archive member, falling back to 7-Zip if zipfile fails.
+
+    Each call opens its own ``ZipFile`` handle so members can be extracted
+    from separate threads.
+    """
+    logger.info("Extracting file: %s", member)
+    try:
+        with (
+            zipfile.ZipFile(zip_file) as z,
+            z.open(member) as src,
+            open(raw_folder / member, "wb") as dst,
+        ):
+            shutil.copyfileobj(src, dst, length=EXTRACT_BUFFER_SIZE)
+    except Exception:
+        logger.warning(
+            "Could not unzip file: %s with zipfile. Using 7z instead.", member
+        )
+        unzip_string = "C:/Program Files/7-Zip/7z.exe"
+        p = subprocess.Popen(
+            [unzip_string, "e", str(zip_file), f"-o{raw_folder}", member, "-y"]
+        )
+        p.wait()
 
 
 def unzip_hmda_file(
     zip_file: Path | str, raw_folder: Path | str, replace: bool = False
 ) -> Path:
-    """Extract a compressed HMDA archive and return extracted file path."""
+    """Extract a compressed HMDA archive and return extracted file path.
+
+    Archives with several delimited members have them extracted in parallel.
+    """
     from .io import replace_csv_column_names  # local import
 
     zip_file = Path(zip_file)
@@ -106,39 +192,104 @@ def unzip_hmda_file(
         delimited_files = [
             x for x in z.namelist() if (x.endswith(".txt") or x.endswith(".csv")) and "/" not in x
         ]
-        for file in delimited_files:
-            raw_file_name = raw_folder / file
-            if (not raw_file_name.exists()) or replace:
-                logger.info("Extracting file: %s", file)
-                try:
-                    z.extract(file, path=raw_folder)
-                except Exception:
-                    logger.warning(
-                        "Could not unzip file: %s with zipfile. Using 7z instead.", file
-                    )
-                    unzip_string = "C:/Program Files/7-Zip/7z.exe"
-                    p = subprocess.Popen(
-                        [unzip_string, "e", str(zip_file), f"-o{raw_folder}", file, "-y"]
-                    )
-                    p.wait()
-
-            if "panel" in file:
-                column_name_mapper = {
-                    "topholder_rssd": "top_holder_rssd",
-                    "topholder_name": "top_holder_name",
-                    "upper": "lei",
-                }
-                replace_csv_column_names(raw_file_name, column_name_mapper=column_name_mapper)
+
+    to_extract = [
+        file for file in delimited_files if replace or not (raw_folder / file).exists()
+    ]
+    if to_extract:
+        # Decompression releases the GIL, so threads overlap across members
+        with ThreadPoolExecutor(max_workers=min(8, len(to_extract))) as executor:
+            list(
+                executor.map(
+                    lambda member: _extract_zip_member(zip_file, member, raw_folder),
+                    to_extract,
+                )
+            )
+
+    for file in delimited_files:
+        raw_file_name = raw_folder / file
+        if "panel" in file:
+            replace_csv_column_names(
+                raw_file_name, column_name_mapper=PANEL_COLUMN_NAME_MAPPER
+            )
 
     return raw_file_name
 
 
+def iter_zip_delimited_batches(
+    zip_file: Path | str, block_size: int = 64 << 20
+) -> Iterator[pa.RecordBatch]:
+    """Stream the delimited file inside an HMDA archive as string record batches.
+
+    The archive member is decompressed on the fly and parsed incrementally, so
+    nothing is extracted to disk. Arrow's streaming reader reads ahead on a
+    background thread, overlapping decompression with downstream processing.
+
+    Parameters
+    ----------
+    zip_file : Path | str
+        Path to the HMDA ZIP archive
+    block_size : int, optional
+        Approximate number of uncompressed bytes parsed per batch. Default is
+        64 MiB.
+
+    Yields
+    ------
+    pa.RecordBatch
+        Batches with every column read as a string and empty fields as nulls,
+        matching ``pl.scan_csv(..., infer_schema=False)``. Panel headers are
+        renamed as in ``unzip_hmda_file``.
+
+    Raises
+    ------
+    ValueError
+        If the archive contains no top-level .txt or .csv file
+    NotImplementedError
+        If the member uses a compression method ``zipfile`` cannot stream
+        (e.g. Deflate64); callers can fall back to ``unzip_hmda_file``
+    """
+    with zipfile.ZipFile(zip_file) as z:
+        delimited_files = [
+            x for x in z.namelist() if (x.endswith(".txt") or x.endswith(".csv")) and "/" not in x
+        ]
+        if not delimited_files:
+            raise ValueError(f"No delimited file found in archive: {zip_file}")
+        file = delimited_files[-1]
+
+        # Sniff the delimiter and header from the start of the member
+        with z.open(file) as f:
+            sample = f.read(16000).decode("latin-1")
+        delimiter = _detect_delimiter(sample)
+        column_names = [
+            name.strip().strip('"') for name in sample.splitlines()[0].split(delimiter)
+        ]
+        if "panel" in file:
+            column_names = [PANEL_COLUMN_NAME_MAPPER.get(x, x) for x in column_names]
+
+        logger.info("Streaming file from archive: %s", file)
+        with z.open(file) as f:
+            reader = pv.open_csv(
+                f,
+                read_options=pv.ReadOptions(
+                    column_names=column_names, skip_rows=1, block_size=block_size
+                ),
+                parse_options=pv.ParseOptions(delimiter=delimiter),
+                convert_options=pv.ConvertOptions(
+                    column_types={name: pa.string() for name in column_names},
+                    null_values=[""],
+                    strings_can_be_null=True,
+                ),
+            )
+            yield from reader
+
+
 __all__ = [
     "normalized_file_stem",
     "should_process_output",
     "get_delimiter",
     "replace_csv_column_names",
     "unzip_hmda_file",
+    "iter_zip_delimited_batches",
 ]
 
 